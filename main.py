@@ -17,7 +17,7 @@ import time
 from src.camelot.api.calculator import router as api_router
 from src.camelot.api import calculator as calc_module
 from src.camelot.api.game_routes import router as game_router
-from src.camelot.web.routes import router as web_router
+from src.camelot.web.routes import router as web_router, warm_page_cache
 from src.camelot.core.cache_init import initialize_cache_system, get_cache_manager
 from src.camelot.core.websocket_manager import websocket_manager
 import config
@@ -59,6 +59,9 @@ async def startup_event():
     """Initialize application on startup."""
     print("🏰 Camelot is starting up...")
     
+    # Compile and render the web pages before serving traffic
+    warm_page_cache()
+    
     # Initialize cache system
     calculator, cache_storage = initialize_cache_system()
     
@@ -102,7 +102,7 @@ async def process_player_action(game_id: str, request: PlayerActionRequest) -> D
         # Check if this is a duplicate request
         is_duplicate = False
         if request.request_id and hasattr(game, '_processed_requests'):
-            is_duplicate = request.request_id in game._processed_requests
+            is_duplicate = game._get_cached_request(request.request_id) is not None
         
         # Record the request
         game_monitor.record_request(
@@ -463,7 +463,7 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str, player_id: str)
                         request_id = action_data.get("request_id")
                         
                         # Record the request
-                        is_duplicate = request_id and hasattr(game, '_processed_requests') and request_id in game._processed_requests
+                        is_duplicate = request_id and hasattr(game, '_processed_requests') and game._get_cached_request(request_id) is not None
                         game_monitor.record_request(game_id, player_id, action_data.get("action"), request_id, is_duplicate)
                         
                         # Process the action
@@ -5,7 +5,7 @@ Evaluates 7 cards (2 hole + 5 community) to find the best 5-card hand.
 Handles ranking, comparison, and tie-breaking.
 """
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Sequence
 from itertools import combinations
 from collections import Counter
 
@@ -73,6 +73,20 @@ class Card:
         return self.rank < other.rank
 
 
+# Parsed cards keyed by their string form - there are only 52 (plus 'T' aliases),
+# so each card string is parsed once per process instead of at every showdown
+_CARD_CACHE: Dict[str, Card] = {}
+
+
+def parse_card(card_str: str) -> Card:
+    """Return the Card for a card string, reusing the parsed instance when available."""
+    card = _CARD_CACHE.get(card_str)
+    if card is None:
+        card = Card(card_str)  # Raises ValueError for invalid cards, which are never cached
+        _CARD_CACHE[card_str] = card
+    return card
+
+
 class HandEvaluation:
     """Result of evaluating a poker hand."""
     def __init__(self, rank: int, value: Tuple[int, ...], cards: List[Card], name: str):
@@ -108,8 +122,12 @@ def evaluate_hand(hole_cards: List[str], community_cards: List[str]) -> HandEval
         HandEvaluation object with rank, value, cards, and name
     """
     # Convert all cards to Card objects
-    all_cards = [Card(c) for c in hole_cards + community_cards]
-    
+    all_cards = [parse_card(c) for c in hole_cards + community_cards]
+    return evaluate_cards(all_cards)
+
+
+def evaluate_cards(all_cards: Sequence[Card]) -> HandEvaluation:
+    """Evaluate the best 5-card poker hand from already-parsed cards."""
     # Find best 5-card combination
     best_eval = None
     
@@ -251,10 +269,27 @@ def get_winning_players(hole_cards_dict: Dict[str, List[str]],
     Returns:
         Tuple of (winner_ids, all_evaluations)
     """
-    evaluations = {}
+    # The board is shared, so it is parsed once rather than once per player
+    board = tuple(parse_card(c) for c in community_cards)
+    players_cards = {
+        player_id: tuple(parse_card(c) for c in hole_cards)
+        for player_id, hole_cards in hole_cards_dict.items()
+    }
+    return get_winning_players_preparsed(players_cards, board)
+
+
+def get_winning_players_preparsed(players_cards: Dict[str, Sequence[Card]],
+                                  board_cards: Sequence[Card]) -> Tuple[List[str], Dict[str, HandEvaluation]]:
+    """
+    Determine winning player(s) from already-parsed Card objects.
     
-    for player_id, hole_cards in hole_cards_dict.items():
-        evaluations[player_id] = evaluate_hand(hole_cards, community_cards)
+    Same as get_winning_players, for callers that evaluate the same cards repeatedly.
+    """
+    board = tuple(board_cards)
+    evaluations = {
+        player_id: evaluate_cards(tuple(hole_cards) + board)
+        for player_id, hole_cards in players_cards.items()
+    }
     
     winners = compare_hands(evaluations)
     
@@ -30,6 +30,15 @@ class PlayerConnection:
         except Exception as e:
             logger.error(f"Error sending to {self.player_id}: {e}")
             return False
+    
+    async def send_text(self, text: str) -> bool:
+        """Send an already-encoded JSON message to the client, return True if successful"""
+        try:
+            await self.websocket.send_text(text)
+            return True
+        except Exception as e:
+            logger.error(f"Error sending to {self.player_id}: {e}")
+            return False
 
 
 class GameRoom:
@@ -103,11 +112,14 @@ class GameRoom:
         message["game_id"] = self.game_id
         message["server_time"] = time.time()
         
+        # Encode once for every recipient, the same way WebSocket.send_json would
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        
         # Send to all connections except excluded
         disconnected = []
         for player_id, conn in self.connections.items():
             if player_id not in exclude:
-                success = await conn.send_json(message)
+                success = await conn.send_text(text)
                 if not success:
                     disconnected.append(player_id)
         
@@ -20,22 +20,25 @@ camelot_dir = os.path.dirname(game_dir)
 src_dir = os.path.dirname(camelot_dir)
 project_root = os.path.dirname(src_dir)
 log_dir = os.path.join(project_root, 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-# Use the same rotating log file as poker_game
-from logging.handlers import RotatingFileHandler
 log_filename = os.path.join(log_dir, 'poker_game.log')
-file_handler = RotatingFileHandler(
-    log_filename,
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5,  # Keep 5 old files
-    encoding='utf-8'
-)
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
-logger.setLevel(logging.DEBUG)
+
+# Only attach the handler once - a module reload must not duplicate it
+if not logger.handlers:
+    os.makedirs(log_dir, exist_ok=True)
+    
+    # Use the same rotating log file as poker_game
+    from logging.handlers import RotatingFileHandler
+    file_handler = RotatingFileHandler(
+        log_filename,
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5,  # Keep 5 old files
+        encoding='utf-8'
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(file_formatter)
+    logger.addHandler(file_handler)
+    logger.setLevel(logging.DEBUG)
 
 
 class AIPlayer:
@@ -1,18 +1,22 @@
 """Texas Hold'em Game Engine with animations and visual effects"""
 
+import copy
 import random
 import time
 import json
-from typing import List, Dict, Optional, Tuple, Any
-from enum import Enum, auto
+from typing import List, Dict, Optional, Tuple, Any, NamedTuple
+from enum import Enum, IntEnum, auto
 from dataclasses import dataclass, field
 import asyncio
+import itertools
 import logging
 import os
+from collections import OrderedDict, deque
+from functools import lru_cache
 from datetime import datetime
 
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from ..core.hand_evaluator import evaluate_hand, get_winning_players, HandEvaluation
+from ..core.hand_evaluator import get_winning_players_preparsed, parse_card
 
 # Set up file-only logging for poker game
 logger = logging.getLogger(__name__)
@@ -27,39 +31,45 @@ camelot_dir = os.path.dirname(game_dir)  # .../camelot/
 src_dir = os.path.dirname(camelot_dir)  # .../src/
 project_root = os.path.dirname(src_dir)  # .../camelot/
 log_dir = os.path.join(project_root, 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-# Use rotating file handler - max 10MB per file, keep 5 backup files
 log_filename = os.path.join(log_dir, 'poker_game.log')
-file_handler = RotatingFileHandler(
-    log_filename,
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5,  # Keep 5 old files
-    encoding='utf-8'
-)
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
-logger.setLevel(logging.DEBUG)
 
-# Also add a daily rotating handler for bug reports specifically
-bug_report_filename = os.path.join(log_dir, 'bug_reports.log')
-bug_handler = TimedRotatingFileHandler(
-    bug_report_filename,
-    when='midnight',  # Rotate daily
-    interval=1,
-    backupCount=30,  # Keep 30 days of bug reports
-    encoding='utf-8'
-)
-bug_handler.setLevel(logging.ERROR)  # Only ERROR level (bug reports)
-bug_handler.setFormatter(file_formatter)
-logger.addHandler(bug_handler)
+# Only attach handlers once - a module reload (uvicorn --reload, pytest) must not duplicate them
+if not logger.handlers:
+    os.makedirs(log_dir, exist_ok=True)
+    
+    # Use rotating file handler - max 10MB per file, keep 5 backup files
+    file_handler = RotatingFileHandler(
+        log_filename,
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5,  # Keep 5 old files
+        encoding='utf-8'
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(file_formatter)
+    logger.addHandler(file_handler)
+    logger.setLevel(logging.DEBUG)
+
+    # Also add a daily rotating handler for bug reports specifically
+    bug_report_filename = os.path.join(log_dir, 'bug_reports.log')
+    bug_handler = TimedRotatingFileHandler(
+        bug_report_filename,
+        when='midnight',  # Rotate daily
+        interval=1,
+        backupCount=30,  # Keep 30 days of bug reports
+        encoding='utf-8'
+    )
+    bug_handler.setLevel(logging.ERROR)  # Only ERROR level (bug reports)
+    bug_handler.setFormatter(file_formatter)
+    logger.addHandler(bug_handler)
 
 logger.info(f"\n{'='*80}\nNEW POKER GAME SESSION STARTED\nLog file: {log_filename}\n{'='*80}")
 
+# Shared placeholder for AI hole cards that must stay hidden from the client
+_HIDDEN_CARDS = ("?", "?")
 
-class GamePhase(Enum):
+
+class GamePhase(IntEnum):
     """Game phases for Texas Hold'em"""
     WAITING = auto()
     PRE_FLOP = auto()
@@ -70,6 +80,14 @@ class GamePhase(Enum):
     GAME_OVER = auto()
 
 
+# Betting street -> (street that follows it, board cards expected before advancing)
+_NEXT_STREET = {
+    GamePhase.PRE_FLOP: (GamePhase.FLOP, 0),
+    GamePhase.FLOP: (GamePhase.TURN, 3),
+    GamePhase.TURN: (GamePhase.RIVER, 4),
+}
+
+
 class PlayerAction(Enum):
     """Possible player actions"""
     CHECK = "check"
@@ -79,7 +97,7 @@ class PlayerAction(Enum):
     ALL_IN = "all_in"
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     """Player in the game"""
     id: str
@@ -102,22 +120,51 @@ class Player:
         self.has_folded = False
         self.last_action = None
         self.is_active = self.stack > 0
-        
-        # Clear hand history attributes
-        if hasattr(self, '_won_amount'):
-            delattr(self, '_won_amount')
-        if hasattr(self, '_winning_hand'):
-            delattr(self, '_winning_hand')
 
 
-@dataclass
+@dataclass(slots=True)
 class Pot:
     """Represents a pot (main or side)"""
     amount: int
     eligible_players: List[str]  # Player IDs
 
 
-@dataclass
+class Animation(NamedTuple):
+    """A single client animation step - serialized to a dict only when returned to the client"""
+    type: str
+    delay: int = 0
+    player_id: Optional[str] = None
+    amount: Optional[int] = None
+    blind_type: Optional[str] = None
+    card_index: Optional[int] = None
+    is_hero: Optional[bool] = None
+    card: Optional[str] = None
+    position: Optional[int] = None
+    action: Optional[str] = None
+    cards: Optional[List[str]] = None
+    winner_id: Optional[str] = None
+    pot_number: Optional[int] = None
+    hand_name: Optional[str] = None
+    stack_before_win: Optional[int] = None
+    message: Optional[str] = None
+    sound: Optional[str] = None
+    phase: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict shape the frontend expects, omitting unset fields"""
+        return {k: v for k, v in zip(self._fields, self) if v is not None}
+
+
+@lru_cache(maxsize=None)
+def _seat_order(num_players: int) -> Tuple[Tuple[int, ...], ...]:
+    """For each seat, the other seats in clockwise order ending back at that seat"""
+    return tuple(
+        tuple((position + i) % num_players for i in range(1, num_players + 1))
+        for position in range(num_players)
+    )
+
+
+@dataclass(slots=True)
 class GameState:
     """Complete game state"""
     game_id: str
@@ -136,30 +183,105 @@ class GameState:
     
     # Animation and visual state
     last_action_info: Dict[str, Any] = field(default_factory=dict)
-    pending_animations: List[Dict[str, Any]] = field(default_factory=list)
+    pending_animations: List[Animation] = field(default_factory=list)
     
     # Turn-based card dealing
     awaiting_card_deal: bool = False
     all_players_all_in: bool = False
-    cards_dealt_for_phase: Dict[GamePhase, bool] = field(default_factory=dict)
+    cards_dealt_mask: int = 0  # Bit (1 << phase.value) set once that phase's cards are dealt
+    
+    # Running sum of every player's total_bet_this_hand, maintained by _place_bet
+    total_wagered: int = 0
+    
+    # Blind positions for the current hand, fixed when the button moves
+    sb_position: int = -1
+    bb_position: int = -1
+    
+    # Index of the next card to deal - the deck itself is never mutated mid-hand
+    deck_cursor: int = 0
+    # Bit i set = player at position i has not folded (-1 sets every bit, i.e. nobody has folded)
+    in_hand_mask: int = -1
+    # get_players_in_hand() result and the in_hand_mask it was built from
+    _in_hand_cache: Optional[List[Player]] = field(default=None, init=False, repr=False)
+    _in_hand_cache_mask: int = field(default=0, init=False, repr=False)
+    # Player id -> Player, built on first lookup (the seating never changes mid-game)
+    _players_by_id: Optional[Dict[str, Player]] = field(default=None, init=False, repr=False)
+    
+    def copy(self) -> 'GameState':
+        """Copy the state for snapshots and rollback.
+        
+        Cheaper than deepcopy: cards and animations are immutable and the deck
+        is never mutated mid-hand, so only players, pots and containers are copied.
+        """
+        state = copy.copy(self)
+        state.players = []
+        for player in self.players:
+            player_copy = copy.copy(player)
+            player_copy.hole_cards = list(player.hole_cards)
+            state.players.append(player_copy)
+        state.pots = [Pot(pot.amount, list(pot.eligible_players)) for pot in self.pots]
+        state.board_cards = list(self.board_cards)
+        state.last_action_info = dict(self.last_action_info)
+        state.pending_animations = list(self.pending_animations)
+        # Both caches would still point at the original players
+        state._in_hand_cache = None
+        state._players_by_id = None
+        return state
+    
+    def clear_bets(self):
+        """Zero every player's bets once the hand's chips have been awarded"""
+        for player in self.players:
+            player.current_bet = 0
+            player.total_bet_this_hand = 0
+        self.total_wagered = 0
+    
+    def get_player(self, player_id: str) -> Optional[Player]:
+        """Get a player by id"""
+        if self._players_by_id is None:
+            self._players_by_id = {p.id: p for p in self.players}
+        return self._players_by_id.get(player_id)
+    
+    def fold_player(self, player: Player):
+        """Mark a player as folded, keeping the in-hand mask in sync"""
+        player.has_folded = True
+        self.in_hand_mask &= ~(1 << player.position)
     
     def get_active_players(self) -> List[Player]:
         """Get all active (not folded) players who can still act"""
         # Note: This should only be used for determining who CAN act
         # For betting round completion, use get_players_in_hand() instead
-        return [p for p in self.players if not p.has_folded and p.stack > 0]
+        return [p for p in self.get_players_in_hand() if p.stack > 0]
     
     def get_players_in_hand(self) -> List[Player]:
-        """Get all players still in the hand (not folded)"""
-        return [p for p in self.players if not p.has_folded]
+        """Get all players still in the hand (not folded).
+        
+        The list is cached until in_hand_mask changes, so callers must not mutate it.
+        """
+        if self._in_hand_cache is not None and self._in_hand_cache_mask == self.in_hand_mask:
+            return self._in_hand_cache
+        players = self.players
+        mask = self.in_hand_mask & ((1 << len(players)) - 1)
+        in_hand = []
+        while mask:
+            low_bit = mask & -mask
+            in_hand.append(players[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        self._in_hand_cache = in_hand
+        self._in_hand_cache_mask = self.in_hand_mask
+        return in_hand
+    
+    def seats_after(self, position: int) -> Tuple[int, ...]:
+        """Seat positions clockwise from the one after position, looping back to it"""
+        return _seat_order(len(self.players))[position]
     
     def get_next_active_position(self, position: int) -> int:
         """Get next active player position"""
-        n = len(self.players)
-        for i in range(1, n + 1):  # Check all players including looping back
-            next_pos = (position + i) % n
+        mask = self.in_hand_mask
+        for next_pos in self.seats_after(position):  # Check all players including looping back
+            if not (mask >> next_pos) & 1:
+                continue  # Folded
             player = self.players[next_pos]
-            if not player.has_folded and player.stack > 0:
+            if player.stack > 0:
                 # In betting round, player needs to act if they haven't matched current bet
                 # OR if they haven't acted yet (last_action is None)
                 if player.current_bet < self.current_bet or player.last_action is None:
@@ -179,36 +301,41 @@ class PokerGame:
         self.game_id = f"game_{int(time.time() * 1000)}"
         self.config = game_config
         self.state = self._initialize_game_state()
+        self.state.sb_position, self.state.bb_position = self._compute_blind_positions()
         self.hand_history = []  # List of completed hands with all actions and results
         self._last_phase_change = None  # Track rapid phase transitions
-        self._processing_action = False  # Prevent concurrent action processing
-        self._action_lock = asyncio.Lock()  # Thread-safe action processing
-        self._processed_requests = {}  # Track processed requests by ID {request_id: (timestamp, result)}
+        self._action_lock: Optional[asyncio.Lock] = None  # Serializes action processing, created on first action
+        self._processed_requests = OrderedDict()  # Track processed requests by ID, oldest first {request_id: (timestamp, result)}
         self._request_cache_ttl = 5.0  # 5 seconds TTL for request cache
+        self._max_cached_requests = 256  # Oldest requests are evicted beyond this
         self._state_version = 0  # For optimistic locking
-        self._chip_movements = []  # Audit trail for all chip movements
+        self._serialized_state = None  # _serialize_state() result, dropped whenever the state may change
+        # Audit trail for recent chip movements, capped so long sessions stay bounded
+        self._chip_movements = deque(maxlen=game_config.get('maxChipMovements', 10000))
+        self._chip_movement_count = 0  # Movements ever recorded, including those rotated out
         self._state_snapshots = {}  # Store state snapshots for rollback {version: state}
-        self._max_snapshots = 10  # Keep last 10 snapshots
+        self._max_snapshots = 10  # Keep last 10 snapshots in debug mode, otherwise just the latest
+        self._debug = game_config.get('debugValidate', False)  # Full state validation around every action
+        # Config never changes during a game, so the chip total is fixed up front
+        self._expected_total_chips = (game_config['heroStack'] + sum(game_config['opponentStacks'])) * game_config['bigBlind']
         
-        logger.info(f"\n{'='*60}\nINITIALIZING NEW GAME: {self.game_id}")
-        logger.info(f"Config: {json.dumps(game_config, indent=2)}")
+        logger.info("\n%s\nINITIALIZING NEW GAME: %s", '='*60, self.game_id)
         
         # Log total chips in play
-        total_chips = (game_config['heroStack'] + sum(game_config['opponentStacks'])) * game_config['bigBlind']
-        logger.info(f"Total chips in play: ${total_chips}")
-        logger.info(f"  Hero: {game_config['heroStack']} BB × ${game_config['bigBlind']} = ${game_config['heroStack'] * game_config['bigBlind']}")
-        for i, stack in enumerate(game_config['opponentStacks']):
-            logger.info(f"  Opponent {i+1}: {stack} BB × ${game_config['bigBlind']} = ${stack * game_config['bigBlind']}")
+        logger.info("Total chips in play: $%d", self._expected_total_chips)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Config: %s", json.dumps(game_config))
+            big_blind = game_config['bigBlind']
+            logger.debug("  Hero: %d BB × $%d = $%d", game_config['heroStack'], big_blind, game_config['heroStack'] * big_blind)
+            for i, stack in enumerate(game_config['opponentStacks']):
+                logger.debug("  Opponent %d: %d BB × $%d = $%d", i + 1, stack, big_blind, stack * big_blind)
         
-        logger.info(f"{'='*60}\n")
+        logger.info("%s\n", '='*60)
         
     def _initialize_game_state(self) -> GameState:
         """Initialize a new game state"""
         # Create deck
-        deck = []
-        for rank in self.RANKS:
-            for suit in self.SUITS:
-                deck.append(f"{rank}{suit}")
+        deck = list(_FULL_DECK)
         random.shuffle(deck)
         
         # Create players
@@ -262,12 +389,14 @@ class PokerGame:
     
     def start_new_hand(self) -> Dict[str, Any]:
         """Start a new hand with animations"""
-        logger.info(f"\n{'='*60}\nSTARTING NEW HAND #{self.state.hand_number + 1}\n{'='*60}")
-        
-        # Log current game state
-        logger.info("Current player states:")
-        for p in self.state.players:
-            logger.info(f"  {p.name}: stack=${p.stack}, position={p.position}, is_ai={p.is_ai}")
+        self._serialized_state = None
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n%s\nSTARTING NEW HAND #%d\n%s", '='*60, self.state.hand_number + 1, '='*60)
+            
+            # Log current game state
+            logger.info("Current player states:")
+            for p in self.state.players:
+                logger.info("  %s: stack=$%d, position=%d, is_ai=%s", p.name, p.stack, p.position, p.is_ai)
         
         # First check if only one player has chips (game over)
         players_with_chips = [p for p in self.state.players if p.stack > 0]
@@ -290,9 +419,7 @@ class PokerGame:
         
         # Validate chip integrity at start of hand
         total_chips_start = sum(p.stack for p in self.state.players)
-        expected_total = self.config['heroStack'] * self.config['bigBlind']
-        for stack in self.config['opponentStacks']:
-            expected_total += stack * self.config['bigBlind']
+        expected_total = self._expected_total_chips
         
         if total_chips_start != expected_total:
             logger.error(f"CHIP INTEGRITY ERROR at start of hand #{self.state.hand_number}!")
@@ -305,31 +432,31 @@ class PokerGame:
         self.state.current_bet = 0
         self.state.min_raise = self.state.big_blind
         
-        # Move dealer button (skip players with no chips)
-        self.state.dealer_position = self._get_next_active_dealer_position()
+        # Move dealer button (skip players with no chips) and fix the blinds for the hand
+        self.state.dealer_position, self.state.sb_position, self.state.bb_position = self._compute_hand_positions()
         
         # Reset players
         for player in self.state.players:
             player.reset_for_new_hand()
+        self.state.in_hand_mask = -1
+        self.state.total_wagered = 0
         
-        # Shuffle deck
-        self.state.deck = []
-        for rank in self.RANKS:
-            for suit in self.SUITS:
-                self.state.deck.append(f"{rank}{suit}")
-        random.shuffle(self.state.deck)
+        # Draw only the cards this hand can use: two per player with chips,
+        # five board cards and three burns
+        active_players = [p for p in self.state.players if p.stack > 0]
+        self.state.deck = random.sample(_FULL_DECK, 2 * len(active_players) + 8)
+        self.state.deck_cursor = 0
         
         # Clear board
         self.state.board_cards = []
         
         # Reset pots
-        active_players = [p for p in self.state.players if p.stack > 0]
         self.state.pots = []
         
         # Reset turn-based card dealing flags
         self.state.awaiting_card_deal = False
         self.state.all_players_all_in = False
-        self.state.cards_dealt_for_phase = {}
+        self.state.cards_dealt_mask = 0
         
         # Set phase to PRE_FLOP early to ensure blinds are logged correctly
         self.state.phase = GamePhase.PRE_FLOP
@@ -338,53 +465,63 @@ class PokerGame:
         animations = []
         
         # Small blind
-        sb_position = self._get_small_blind_position()
+        sb_position = self.state.sb_position
         sb_player = self.state.players[sb_position]
         sb_amount = min(self.state.small_blind, sb_player.stack)
         self._place_bet(sb_player, sb_amount)
         
-        animations.append({
-            "type": "blind_post",
-            "player_id": sb_player.id,
-            "amount": sb_amount,
-            "blind_type": "small",
-            "delay": 0
-        })
+        animations.append(Animation(
+            type="blind_post",
+            player_id=sb_player.id,
+            amount=sb_amount,
+            blind_type="small",
+            delay=0
+        ))
         
         # Big blind
-        bb_position = self._get_big_blind_position()
+        bb_position = self.state.bb_position
         bb_player = self.state.players[bb_position]
         bb_amount = min(self.state.big_blind, bb_player.stack)
         self._place_bet(bb_player, bb_amount)
         
-        animations.append({
-            "type": "blind_post",
-            "player_id": bb_player.id,
-            "amount": bb_amount,
-            "blind_type": "big",
-            "delay": 500
-        })
+        animations.append(Animation(
+            type="blind_post",
+            player_id=bb_player.id,
+            amount=bb_amount,
+            blind_type="big",
+            delay=500
+        ))
         
         # Deal hole cards with staggered animations
+        # Bind the hot lookups to locals once - this loop runs for every seat, twice
+        players = self.state.players
+        deck = self.state.deck
+        cursor = self.state.deck_cursor
+        add_animation = animations.append
+        log_deals = logger.isEnabledFor(logging.INFO)
         delay = 1000
         for i in range(2):  # Two cards per player
-            for player in self.state.players:
+            for player in players:
                 if player.stack > 0:  # Only deal to players with chips
-                    card = self.state.deck.pop()
+                    card = deck[cursor]
+                    cursor += 1
                     player.hole_cards.append(card)
+                    is_hero = not player.is_ai
                     # Log what we're dealing
-                    logger.info(f"Dealing card {i} to {player.name}: {'[hidden]' if player.is_ai else card}")
-                    animations.append({
-                        "type": "deal_card",
-                        "player_id": player.id,
-                        "card_index": i,
-                        "is_hero": not player.is_ai,
-                        "card": card if not player.is_ai else None,  # Include card data for hero
-                        "delay": delay
-                    })
+                    if log_deals:
+                        logger.info("Dealing card %d to %s: %s", i, player.name, card if is_hero else '[hidden]')
+                    add_animation(Animation(
+                        type="deal_card",
+                        player_id=player.id,
+                        card_index=i,
+                        is_hero=is_hero,
+                        card=card if is_hero else None,  # Include card data for hero
+                        delay=delay
+                    ))
                     delay += 100
-                else:
-                    logger.info(f"Skipping deal for {player.name} - no chips remaining")
+                elif log_deals:
+                    logger.info("Skipping deal for %s - no chips remaining", player.name)
+        self.state.deck_cursor = cursor
         
         # Set betting amounts (phase already set to PRE_FLOP above)
         self.state.current_bet = self.state.big_blind
@@ -393,14 +530,16 @@ class PokerGame:
         # Now set action to first player after BB
         self.state.action_on = self._get_first_to_act_position()
         
-        logger.info(f"\nHAND SETUP COMPLETE:")
-        logger.info(f"  Hand number: {self.state.hand_number}")
-        logger.info(f"  Dealer: position {self.state.dealer_position} ({self.state.players[self.state.dealer_position].name})")
-        logger.info(f"  Small blind: position {sb_position} ({sb_player.name}) - ${sb_amount}")
-        logger.info(f"  Big blind: position {bb_position} ({bb_player.name}) - ${bb_amount}")
-        logger.info(f"  First to act: position {self.state.action_on} ({self.state.players[self.state.action_on].name if self.state.action_on >= 0 else 'None'})")
-        logger.info(f"  Current bet: ${self.state.current_bet}")
-        logger.info(f"  Phase: {self.state.phase.name}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\nHAND SETUP COMPLETE:")
+            logger.info("  Hand number: %d", self.state.hand_number)
+            logger.info("  Dealer: position %d (%s)", self.state.dealer_position, self.state.players[self.state.dealer_position].name)
+            logger.info("  Small blind: position %d (%s) - $%d", sb_position, sb_player.name, sb_amount)
+            logger.info("  Big blind: position %d (%s) - $%d", bb_position, bb_player.name, bb_amount)
+            logger.info("  First to act: position %d (%s)", self.state.action_on,
+                        self.state.players[self.state.action_on].name if self.state.action_on >= 0 else 'None')
+            logger.info("  Current bet: $%d", self.state.current_bet)
+            logger.info("  Phase: %s", self.state.phase.name)
         
         # Ensure board is cleared for new hand (double check)
         if len(self.state.board_cards) > 0:
@@ -411,11 +550,11 @@ class PokerGame:
         self._last_phase_change = None
         
         # Add sound effect animation
-        animations.append({
-            "type": "sound",
-            "sound": "shuffle",
-            "delay": 0
-        })
+        animations.append(Animation(
+            type="sound",
+            sound="shuffle",
+            delay=0
+        ))
         
         self.state.pending_animations = animations
         
@@ -427,44 +566,46 @@ class PokerGame:
         return {
             "success": True,
             "state": self._serialize_state(),
-            "animations": animations,
+            "animations": [a.to_dict() for a in animations],
             "message": f"Hand #{self.state.hand_number} - Blinds {self.state.small_blind}/{self.state.big_blind}"
         }
     
     async def process_action(self, player_id: str, action: PlayerAction, amount: int = 0, request_id: str = None) -> Dict[str, Any]:
         """Process a player action with animations - now properly async with locking"""
-        logger.info(f"\n{'='*50}\nACTION: {player_id} -> {action.value} (${amount}) [request_id: {request_id}]\n{'='*50}")
+        logger.info("\n%s\nACTION: %s -> %s ($%s) [request_id: %s]\n%s", '='*50, player_id, action.value, amount, request_id, '='*50)
         
         # Check for duplicate request
         if request_id:
-            # Clean up old requests
-            self._cleanup_request_cache()
-            
             # Check if we've already processed this request
-            if request_id in self._processed_requests:
-                timestamp, cached_result = self._processed_requests[request_id]
-                logger.warning(f"Duplicate request {request_id} detected, returning cached result")
+            cached_result = self._get_cached_request(request_id)
+            if cached_result is not None:
+                logger.warning("Duplicate request %s detected, returning cached result", request_id)
                 return cached_result
         
         # Acquire lock for action processing
+        if self._action_lock is None:
+            self._action_lock = asyncio.Lock()
         async with self._action_lock:
-            logger.info(f"Lock acquired for {player_id}'s {action.value}")
+            logger.info("Lock acquired for %s's %s", player_id, action.value)
             
             # Double-check game state after acquiring lock
             if self.state.phase == GamePhase.GAME_OVER:
-                logger.error(f"Game is over, rejecting action from {player_id}")
+                logger.error("Game is over, rejecting action from %s", player_id)
                 return {"success": False, "error": "Game is over"}
             
-            # Create state snapshot before processing
+            # Snapshot the state before processing. This copy is kept outside debug mode
+            # too: an exception can leave the action half-applied, and rolling back needs the
+            # whole pre-action state. Only the number of snapshots retained depends on debug.
             state_version_before = self._state_version
-            snapshot = self._create_state_snapshot()
+            self._create_state_snapshot()
             
             # Validate state before action
-            validation_before = self._validate_game_state()
-            if not validation_before["valid"]:
-                logger.error(f"State validation errors BEFORE action: {validation_before['errors']}")
-            if validation_before["warnings"]:
-                logger.warning(f"State validation warnings BEFORE action: {validation_before['warnings']}")
+            if self._debug:
+                validation_before = self._validate_game_state()
+                if not validation_before["valid"]:
+                    logger.error("State validation errors BEFORE action: %s", validation_before['errors'])
+                if validation_before["warnings"]:
+                    logger.warning("State validation warnings BEFORE action: %s", validation_before['warnings'])
             
             try:
                 result = self._do_process_action(player_id, action, amount)
@@ -474,22 +615,23 @@ class PokerGame:
                     self._state_version += 1
                     
                     # Validate state after action
-                    validation_after = self._validate_game_state()
-                    if not validation_after["valid"]:
-                        logger.error(f"State validation errors AFTER action: {validation_after['errors']}")
-                        # Add validation errors to result
-                        result["validation_errors"] = validation_after["errors"]
-                    if validation_after["warnings"]:
-                        logger.warning(f"State validation warnings AFTER action: {validation_after['warnings']}")
+                    if self._debug:
+                        validation_after = self._validate_game_state()
+                        if not validation_after["valid"]:
+                            logger.error("State validation errors AFTER action: %s", validation_after['errors'])
+                            # Add validation errors to result
+                            result["validation_errors"] = validation_after["errors"]
+                        if validation_after["warnings"]:
+                            logger.warning("State validation warnings AFTER action: %s", validation_after['warnings'])
                     
                     # Cache successful result if request_id provided
                     if request_id:
-                        self._processed_requests[request_id] = (time.time(), result)
+                        self._cache_request(request_id, result)
                 
                 return result
             except Exception as e:
-                logger.error(f"Error processing action: {e}")
-                logger.error(f"Rolling back to state version {state_version_before}")
+                logger.error("Error processing action: %s", e)
+                logger.error("Rolling back to state version %s", state_version_before)
                 # Restore state from snapshot
                 if self._restore_state_snapshot(state_version_before):
                     logger.info("Successfully rolled back state")
@@ -499,31 +641,31 @@ class PokerGame:
     
     def _do_process_action(self, player_id: str, action: PlayerAction, amount: int = 0) -> Dict[str, Any]:
         """Internal action processing"""
+        self._serialized_state = None
         # CRITICAL: Reject actions if game is over
         if self.state.phase == GamePhase.GAME_OVER:
-            logger.error(f"ERROR: Attempted action during GAME_OVER phase!")
+            logger.error("ERROR: Attempted action during GAME_OVER phase!")
             return {"success": False, "error": "Hand is already over"}
         
         # Also reject if we're in WAITING phase (between hands)
         if self.state.phase == GamePhase.WAITING:
-            logger.error(f"ERROR: Attempted action during WAITING phase!")
+            logger.error("ERROR: Attempted action during WAITING phase!")
             return {"success": False, "error": "No hand in progress"}
         
-        logger.info(f"Game state BEFORE action:")
-        logger.info(f"  Phase: {self.state.phase.name}")
-        logger.info(f"  Current bet: ${self.state.current_bet}")
-        logger.info(f"  Board cards: {self.state.board_cards}")
-        # Calculate current pot (including current round bets)
-        pot_total = sum(pot.amount for pot in self.state.pots)
-        if pot_total == 0:
-            # During betting rounds, calculate from player contributions
-            pot_total = sum(p.total_bet_this_hand for p in self.state.players)
-        logger.info(f"  Pot total: ${pot_total}")
-        
-        # Log all player states
-        logger.info("Player states:")
-        for p in self.state.players:
-            logger.info(f"  {p.name}: stack=${p.stack}, current_bet=${p.current_bet}, last_action={p.last_action.value if p.last_action else 'None'}, folded={p.has_folded}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Game state BEFORE action:")
+            logger.info("  Phase: %s", self.state.phase.name)
+            logger.info("  Current bet: $%d", self.state.current_bet)
+            logger.info("  Board cards: %s", self.state.board_cards)
+            # Calculate current pot (including current round bets)
+            pot_total = sum(pot.amount for pot in self.state.pots)
+            if pot_total == 0:
+                # During betting rounds, calculate from player contributions
+                pot_total = self.state.total_wagered
+            logger.info("  Pot total: $%d", pot_total)
+            
+            # Log all player states
+            self._log_player_states()
         
         player = self._get_player_by_id(player_id)
         if not player:
@@ -531,7 +673,7 @@ class PokerGame:
         
         # CRITICAL: Reject actions from folded players
         if player.has_folded:
-            logger.error(f"ERROR: Folded player {player_id} attempted to act!")
+            logger.error("ERROR: Folded player %s attempted to act!", player_id)
             return {"success": False, "error": "Cannot act after folding"}
         
         if self.state.players[self.state.action_on].id != player_id:
@@ -540,134 +682,18 @@ class PokerGame:
         animations = []
         
         # Process the action
-        if action == PlayerAction.FOLD:
-            player.has_folded = True
-            player.last_action = action
-            animations.append({
-                "type": "fold",
-                "player_id": player_id,
-                "delay": 0
-            })
-            
-        elif action == PlayerAction.CHECK:
-            # Pre-flop special rules for blinds
-            if self.state.phase == GamePhase.PRE_FLOP:
-                # Check if this player posted a blind
-                bb_position = self._get_big_blind_position()
-                sb_position = self._get_small_blind_position()
-                
-                if player.position == bb_position:
-                    # Big blind can check if no one raised beyond the big blind amount
-                    if self.state.current_bet > self.state.big_blind:
-                        logger.error(f"Big blind cannot check - bet was raised to ${self.state.current_bet}")
-                        return {"success": False, "error": "Cannot check, must call or fold"}
-                    # BB can check when current bet equals big blind (their posted amount)
-                elif player.position == sb_position:
-                    # Small blind cannot check pre-flop, must at least call the big blind
-                    logger.error(f"Small blind cannot check pre-flop - must call ${self.state.current_bet - player.current_bet}")
-                    return {"success": False, "error": "Cannot check, must call or fold"}
-                else:
-                    # Non-blind players cannot check pre-flop if they haven't matched the big blind
-                    if self.state.current_bet > player.current_bet:
-                        logger.error(f"Cannot check - must match bet of ${self.state.current_bet}")
-                        return {"success": False, "error": "Cannot check, must call or fold"}
-            else:
-                # Post-flop: standard check rules - can only check if current bet matches
-                if self.state.current_bet > player.current_bet:
-                    logger.error(f"Cannot check - current bet is ${self.state.current_bet}, player has only bet ${player.current_bet}")
-                    return {"success": False, "error": "Cannot check, must call or fold"}
-            
-            player.last_action = action
-            animations.append({
-                "type": "check",
-                "player_id": player_id,
-                "delay": 0
-            })
-            
-        elif action == PlayerAction.CALL:
-            to_call = self.state.current_bet - player.current_bet
-            call_amount = min(to_call, player.stack)
-            
-            logger.info(f"{player.name} CALLING: current_bet={self.state.current_bet}, player_bet={player.current_bet}")
-            logger.info(f"To call: ${to_call}, Player stack: ${player.stack}, Actual call: ${call_amount}")
-            
-            # If calling requires entire stack, should be ALL_IN instead
-            if call_amount == player.stack and player.stack > 0:
-                logger.warning(f"CALL requires entire stack - should be ALL_IN action instead!")
-            
-            self._place_bet(player, call_amount)
-            player.last_action = action
-            animations.append({
-                "type": "bet",
-                "player_id": player_id,
-                "amount": call_amount,
-                "action": "call",
-                "delay": 0
-            })
-            
-        elif action == PlayerAction.RAISE:
-            if amount < self.state.min_raise:
-                return {"success": False, "error": f"Minimum raise is {self.state.min_raise}"}
-            
-            raise_to = self.state.current_bet + amount
-            bet_amount = min(raise_to - player.current_bet, player.stack)
-            
-            # Log raise validation
-            logger.info(f"RAISE validation: amount={amount}, min_raise={self.state.min_raise}")
-            logger.info(f"Current bet: {self.state.current_bet} -> raise to: {raise_to}")
-            logger.info(f"Player will bet: {bet_amount} (from current {player.current_bet} to {player.current_bet + bet_amount})")
-            
-            self._place_bet(player, bet_amount)
-            self.state.current_bet = player.current_bet
-            # IMPORTANT: min_raise should be at least the amount of this raise
-            # This ensures the next player must raise by at least as much
-            self.state.min_raise = max(amount, self.state.min_raise)
-            player.last_action = action
-            
-            animations.append({
-                "type": "bet",
-                "player_id": player_id,
-                "amount": bet_amount,
-                "action": "raise",
-                "delay": 0
-            })
-            
-        elif action == PlayerAction.ALL_IN:
-            all_in_amount = player.stack
-            logger.info(f"\n*** {player.name} going ALL-IN with ${all_in_amount} ***")
-            logger.info(f"Before all-in: current_bet={self.state.current_bet}, player_bet={player.current_bet}")
-            logger.info(f"Players in hand BEFORE all-in: {len(self.get_players_in_hand())}")
-            
-            self._place_bet(player, all_in_amount)
-            
-            if player.current_bet > self.state.current_bet:
-                logger.info(f"Updating table current_bet from {self.state.current_bet} to {player.current_bet}")
-                self.state.current_bet = player.current_bet
-            else:
-                logger.info(f"All-in amount ({player.current_bet}) doesn't exceed current bet ({self.state.current_bet})")
-            
-            player.last_action = action
-            
-            # Log state after all-in
-            logger.info(f"After all-in: player stack=${player.stack}, player bet=${player.current_bet}")
-            logger.info(f"Players who can still act: {[p.name for p in self.state.players if not p.has_folded and p.stack > 0]}")
-            
-            animations.append({
-                "type": "bet",
-                "player_id": player_id,
-                "amount": all_in_amount,
-                "action": "all_in",
-                "delay": 0
-            })
+        error = self._ACTION_HANDLERS[action](self, player, amount, animations)
+        if error:
+            return error
         
         # Check if only one player remains (others folded)
         players_in_hand = self.get_players_in_hand()
-        logger.info(f"Players still in hand after {player.name}'s {action.value}: {len(players_in_hand)}")
+        logger.info("Players still in hand after %s's %s: %s", player.name, action.value, len(players_in_hand))
         
         if len(players_in_hand) == 1:
             # Everyone else folded - immediate win
             logger.info("All opponents folded - awarding pot to remaining player")
-            logger.info(f"Current board: {self.state.board_cards} (phase: {self.state.phase.name})")
+            logger.info("Current board: %s (phase: %s)", self.state.board_cards, self.state.phase.name)
             # Calculate final pots
             self._calculate_pots()
             # Award pot to remaining player WITHOUT going to showdown
@@ -679,36 +705,34 @@ class PokerGame:
                     stack_before = winner.stack
                     winner.stack += pot.amount
                     total_won += pot.amount
-                    logger.info(f"{winner.name} wins pot of ${pot.amount} (all opponents folded)")
-                    self._record_chip_movement(winner.id, pot.amount, "pot_won_fold", stack_before)
+                    logger.info("%s wins pot of $%s (all opponents folded)", winner.name, pot.amount)
+                    self._record_chip_movement(winner, pot.amount, "pot_won_fold", stack_before)
             
+            winner_info = {}
             if total_won > 0:
-                winner._won_amount = total_won
-                winner._winning_hand = "All opponents folded"
-                animations.append({
-                    "type": "award_pot",
-                    "winner_id": winner.id,
-                    "amount": total_won,
-                    "delay": 500,
-                    "stack_before_win": winner.stack - total_won
-                })
+                winner_info[winner.id] = (total_won, "All opponents folded")
+                animations.append(Animation(
+                    type="award_pot",
+                    winner_id=winner.id,
+                    amount=total_won,
+                    delay=500,
+                    stack_before_win=winner.stack - total_won
+                ))
             
             # Clear pots
             self.state.pots = []
             
             # Mark hand as complete
-            animations.append({
-                "type": "hand_complete",
-                "delay": 1000
-            })
+            animations.append(Animation(
+                type="hand_complete",
+                delay=1000
+            ))
             
             # Record hand history
-            self._record_hand_history()
+            self._record_hand_history(winner_info)
             
             # Clear all player bets
-            for p in self.state.players:
-                p.total_bet_this_hand = 0
-                p.current_bet = 0
+            self.state.clear_bets()
             
             # Set phase to GAME_OVER (for this hand)
             self.state.phase = GamePhase.GAME_OVER
@@ -721,23 +745,24 @@ class PokerGame:
             return {"success": False, "error": "No players remaining in hand"}
         else:
             # Check if betting round is complete
-            logger.info(f"\n*** CHECKING IF BETTING ROUND COMPLETE AFTER {player.name}'s {action.value} ***")
+            logger.info("\n*** CHECKING IF BETTING ROUND COMPLETE AFTER %s's %s ***", player.name, action.value)
             is_complete = self._is_betting_round_complete()
             
             if is_complete:
                 # Move to next phase
-                logger.info(f"*** BETTING ROUND COMPLETE! Advancing from {self.state.phase.name} ***")
+                logger.info("*** BETTING ROUND COMPLETE! Advancing from %s ***", self.state.phase.name)
                 next_phase_result = self._advance_phase()
                 animations.extend(next_phase_result["animations"])
             else:
                 # Move to next player
-                logger.info(f"*** BETTING ROUND NOT COMPLETE - Finding next player ***")
+                logger.info("*** BETTING ROUND NOT COMPLETE - Finding next player ***")
                 next_position = self._get_next_active_position(self.state.action_on)
-                logger.info(f"Next player to act: position {next_position}")
+                logger.info("Next player to act: position %s", next_position)
                 
                 if next_position >= 0:
                     next_player = self.state.players[next_position]
-                    logger.info(f"Next to act: {next_player.name} (current_bet: ${next_player.current_bet}, needs: ${self.state.current_bet - next_player.current_bet})")
+                    logger.info("Next to act: %s (current_bet: $%s, needs: $%s)",
+                                next_player.name, next_player.current_bet, self.state.current_bet - next_player.current_bet)
                 else:
                     logger.error("ERROR: No next player found! This shouldn't happen!")
                 
@@ -746,124 +771,237 @@ class PokerGame:
         self.state.pending_animations = animations
         
         # Final logging
-        logger.info(f"\nGame state AFTER action:")
-        logger.info(f"  Phase: {self.state.phase.name}")
-        logger.info(f"  Current bet: ${self.state.current_bet}")
-        logger.info(f"  Board cards: {self.state.board_cards}")
-        logger.info(f"  Action on: position {self.state.action_on}")
-        logger.info("Player states:")
-        for p in self.state.players:
-            logger.info(f"  {p.name}: stack=${p.stack}, current_bet=${p.current_bet}, last_action={p.last_action.value if p.last_action else 'None'}, folded={p.has_folded}")
-        logger.info(f"{'='*50}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\nGame state AFTER action:")
+            logger.info("  Phase: %s", self.state.phase.name)
+            logger.info("  Current bet: $%d", self.state.current_bet)
+            logger.info("  Board cards: %s", self.state.board_cards)
+            logger.info("  Action on: position %d", self.state.action_on)
+            self._log_player_states()
+            logger.info("%s\n", '='*50)
         
         return {
             "success": True,
             "state": self._serialize_state(),
-            "animations": animations
+            "animations": [a.to_dict() for a in animations]
         }
     
+    def _handle_fold(self, player: Player, amount: int, animations: List[Animation]) -> Optional[Dict[str, Any]]:
+        """Fold the player out of the hand"""
+        self.state.fold_player(player)
+        player.last_action = PlayerAction.FOLD
+        animations.append(Animation(
+            type="fold",
+            player_id=player.id,
+            delay=0
+        ))
+        return None
+    
+    def _handle_check(self, player: Player, amount: int, animations: List[Animation]) -> Optional[Dict[str, Any]]:
+        """Check, enforcing the pre-flop blind rules"""
+        # Pre-flop special rules for blinds
+        if self.state.phase == GamePhase.PRE_FLOP:
+            # Check if this player posted a blind
+            bb_position = self.state.bb_position
+            sb_position = self.state.sb_position
+        
+            if player.position == bb_position:
+                # Big blind can check if no one raised beyond the big blind amount
+                if self.state.current_bet > self.state.big_blind:
+                    logger.error("Big blind cannot check - bet was raised to $%s", self.state.current_bet)
+                    return {"success": False, "error": "Cannot check, must call or fold"}
+                # BB can check when current bet equals big blind (their posted amount)
+            elif player.position == sb_position:
+                # Small blind cannot check pre-flop, must at least call the big blind
+                logger.error("Small blind cannot check pre-flop - must call $%s", self.state.current_bet - player.current_bet)
+                return {"success": False, "error": "Cannot check, must call or fold"}
+            else:
+                # Non-blind players cannot check pre-flop if they haven't matched the big blind
+                if self.state.current_bet > player.current_bet:
+                    logger.error("Cannot check - must match bet of $%s", self.state.current_bet)
+                    return {"success": False, "error": "Cannot check, must call or fold"}
+        else:
+            # Post-flop: standard check rules - can only check if current bet matches
+            if self.state.current_bet > player.current_bet:
+                logger.error("Cannot check - current bet is $%s, player has only bet $%s", self.state.current_bet, player.current_bet)
+                return {"success": False, "error": "Cannot check, must call or fold"}
+        
+        player.last_action = PlayerAction.CHECK
+        animations.append(Animation(
+            type="check",
+            player_id=player.id,
+            delay=0
+        ))
+        return None
+    
+    def _handle_call(self, player: Player, amount: int, animations: List[Animation]) -> Optional[Dict[str, Any]]:
+        """Call the current bet, capped at the player's stack"""
+        to_call = self.state.current_bet - player.current_bet
+        call_amount = min(to_call, player.stack)
+        
+        logger.info("%s CALLING: current_bet=%s, player_bet=%s", player.name, self.state.current_bet, player.current_bet)
+        logger.info("To call: $%s, Player stack: $%s, Actual call: $%s", to_call, player.stack, call_amount)
+        
+        # If calling requires entire stack, should be ALL_IN instead
+        if call_amount == player.stack and player.stack > 0:
+            logger.warning("CALL requires entire stack - should be ALL_IN action instead!")
+        
+        self._place_bet(player, call_amount)
+        player.last_action = PlayerAction.CALL
+        animations.append(Animation(
+            type="bet",
+            player_id=player.id,
+            amount=call_amount,
+            action="call",
+            delay=0
+        ))
+        return None
+    
+    def _handle_raise(self, player: Player, amount: int, animations: List[Animation]) -> Optional[Dict[str, Any]]:
+        """Raise by amount on top of the current bet"""
+        if amount < self.state.min_raise:
+            return {"success": False, "error": f"Minimum raise is {self.state.min_raise}"}
+        
+        raise_to = self.state.current_bet + amount
+        bet_amount = min(raise_to - player.current_bet, player.stack)
+        
+        # Log raise validation
+        logger.info("RAISE validation: amount=%s, min_raise=%s", amount, self.state.min_raise)
+        logger.info("Current bet: %s -> raise to: %s", self.state.current_bet, raise_to)
+        logger.info("Player will bet: %s (from current %s to %s)", bet_amount, player.current_bet, player.current_bet + bet_amount)
+        
+        self._place_bet(player, bet_amount)
+        self.state.current_bet = player.current_bet
+        # IMPORTANT: min_raise should be at least the amount of this raise
+        # This ensures the next player must raise by at least as much
+        self.state.min_raise = max(amount, self.state.min_raise)
+        player.last_action = PlayerAction.RAISE
+        
+        animations.append(Animation(
+            type="bet",
+            player_id=player.id,
+            amount=bet_amount,
+            action="raise",
+            delay=0
+        ))
+        return None
+    
+    def _handle_all_in(self, player: Player, amount: int, animations: List[Animation]) -> Optional[Dict[str, Any]]:
+        """Put the player's entire stack in"""
+        all_in_amount = player.stack
+        log_info = logger.isEnabledFor(logging.INFO)
+        logger.info("\n*** %s going ALL-IN with $%s ***", player.name, all_in_amount)
+        logger.info("Before all-in: current_bet=%s, player_bet=%s", self.state.current_bet, player.current_bet)
+        if log_info:
+            logger.info("Players in hand BEFORE all-in: %s", len(self.get_players_in_hand()))
+        
+        self._place_bet(player, all_in_amount)
+        
+        if player.current_bet > self.state.current_bet:
+            logger.info("Updating table current_bet from %s to %s", self.state.current_bet, player.current_bet)
+            self.state.current_bet = player.current_bet
+        else:
+            logger.info("All-in amount (%s) doesn't exceed current bet (%s)", player.current_bet, self.state.current_bet)
+        
+        player.last_action = PlayerAction.ALL_IN
+        
+        # Log state after all-in
+        logger.info("After all-in: player stack=$%s, player bet=$%s", player.stack, player.current_bet)
+        if log_info:
+            logger.info("Players who can still act: %s", [p.name for p in self.state.players if not p.has_folded and p.stack > 0])
+        
+        animations.append(Animation(
+            type="bet",
+            player_id=player.id,
+            amount=all_in_amount,
+            action="all_in",
+            delay=0
+        ))
+        return None
+    
+    # Each handler applies its action and returns None, or an error result if the action is not allowed
+    _ACTION_HANDLERS = {
+        PlayerAction.FOLD: _handle_fold,
+        PlayerAction.CHECK: _handle_check,
+        PlayerAction.CALL: _handle_call,
+        PlayerAction.RAISE: _handle_raise,
+        PlayerAction.ALL_IN: _handle_all_in,
+    }
+    
     def _advance_phase(self) -> Dict[str, Any]:
         """Advance to next game phase with animations"""
+        state = self.state
         start_time = time.time()
         
-        logger.info(f"\n{'='*60}\nPHASE TRANSITION: {self.state.phase.name} -> NEXT\n{'='*60}")
+        logger.info("\n%s\nPHASE TRANSITION: %s -> NEXT\n%s", '='*60, state.phase.name, '='*60)
         
         # Check for rapid phase transitions
         if self._last_phase_change:
             time_since_last = start_time - self._last_phase_change
             if time_since_last < 2.0:  # Less than 2 seconds
-                logger.error(f"ERROR: RAPID PHASE TRANSITION! Only {time_since_last:.3f}s since last phase change!")
+                logger.error("ERROR: RAPID PHASE TRANSITION! Only %.3fs since last phase change!", time_since_last)
         
         # Log why we're transitioning
         logger.info("TRANSITION REASON: Betting round marked complete")
-        logger.info(f"Current state:")
-        logger.info(f"  Phase: {self.state.phase.name}")
-        logger.info(f"  Board cards: {self.state.board_cards}")
-        logger.info(f"  Current bet: ${self.state.current_bet}")
-        logger.info("Player betting status:")
-        for p in self.get_active_players():
-            logger.info(f"  {p.name}: bet=${p.current_bet}, stack=${p.stack}, last_action={p.last_action.value if p.last_action else 'None'}")
+        logger.info("Current state:")
+        logger.info("  Phase: %s", state.phase.name)
+        logger.info("  Board cards: %s", state.board_cards)
+        logger.info("  Current bet: $%s", state.current_bet)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Player betting status:")
+            for p in self.get_active_players():
+                logger.info("  %s: bet=$%s, stack=$%s, last_action=%s", p.name, p.current_bet, p.stack, p.last_action.value if p.last_action else 'None')
         
         animations = []
         
-        # Add a phase transition notification
-        phase_names = {
-            GamePhase.PRE_FLOP: "Flop",
-            GamePhase.FLOP: "Turn",
-            GamePhase.TURN: "River",
-            GamePhase.RIVER: "Showdown"
-        }
-        next_phase_name = phase_names.get(self.state.phase, "")
-        
         # DON'T calculate pots here - only at showdown!
         # Just reset betting for new round
         logger.info("\nRESETTING BETS FOR NEW BETTING ROUND:")
-        for player in self.state.players:
+        for player in state.players:
             old_bet = player.current_bet
             old_action = player.last_action
             player.current_bet = 0
             # Reset last action for new betting round (except for folded/all-in players)
             if not player.has_folded and player.stack > 0:
                 player.last_action = None
-                logger.info(f"  {player.name}: bet ${old_bet}->$0, action {old_action.value if old_action else 'None'}->None")
+                logger.info("  %s: bet $%s->$0, action %s->None", player.name, old_bet, old_action.value if old_action else 'None')
             else:
-                logger.info(f"  {player.name}: bet ${old_bet}->$0 (folded={player.has_folded}, all-in={player.stack==0})")
-        
-        old_current_bet = self.state.current_bet
-        self.state.current_bet = 0
-        self.state.min_raise = self.state.big_blind
-        logger.info(f"Table current bet: ${old_current_bet} -> $0")
-        
-        if self.state.phase == GamePhase.PRE_FLOP:
-            # Sanity check: board should be empty in pre-flop
-            if len(self.state.board_cards) > 0:
-                logger.error(f"ERROR: Board has {len(self.state.board_cards)} cards in PRE_FLOP phase! Cards: {self.state.board_cards}")
-                logger.error("This should never happen - clearing board")
-                self.state.board_cards = []
-            
-            # Advance to FLOP phase
-            self.state.phase = GamePhase.FLOP
-            logger.info(f"Advanced to FLOP phase. Cards will be dealt on request.")
-            
-            # Mark that we need cards dealt
-            self.state.awaiting_card_deal = True
-            
-        elif self.state.phase == GamePhase.FLOP:
-            # Sanity check: board should have exactly 3 cards in flop
-            if len(self.state.board_cards) != 3:
-                logger.error(f"ERROR: Board has {len(self.state.board_cards)} cards in FLOP phase, expected 3! Cards: {self.state.board_cards}")
-            
-            # Advance to TURN phase
-            self.state.phase = GamePhase.TURN
-            logger.info(f"Advanced to TURN phase. Cards will be dealt on request.")
-            
-            # Mark that we need cards dealt
-            self.state.awaiting_card_deal = True
-            
-        elif self.state.phase == GamePhase.TURN:
-            # Sanity check: board should have exactly 4 cards in turn
-            if len(self.state.board_cards) != 4:
-                logger.error(f"ERROR: Board has {len(self.state.board_cards)} cards in TURN phase, expected 4! Cards: {self.state.board_cards}")
-            
-            # Advance to RIVER phase
-            self.state.phase = GamePhase.RIVER
-            logger.info(f"Advanced to RIVER phase. Cards will be dealt on request.")
+                logger.info("  %s: bet $%s->$0 (folded=%s, all-in=%s)", player.name, old_bet, player.has_folded, player.stack==0)
+        
+        old_current_bet = state.current_bet
+        state.current_bet = 0
+        state.min_raise = state.big_blind
+        logger.info("Table current bet: $%s -> $0", old_current_bet)
+        
+        next_street = _NEXT_STREET.get(state.phase)
+        if next_street is not None:
+            next_phase, expected_cards = next_street
+            # Sanity check: board should hold exactly the cards dealt so far
+            if len(state.board_cards) != expected_cards:
+                logger.error("ERROR: Board has %s cards in %s phase, expected %s! Cards: %s", len(state.board_cards), state.phase.name, expected_cards, state.board_cards)
+                if expected_cards == 0:
+                    logger.error("This should never happen - clearing board")
+                    state.board_cards = []
+            
+            # Advance to the next street
+            state.phase = next_phase
+            logger.info("Advanced to %s phase. Cards will be dealt on request.", next_phase.name)
             
             # Mark that we need cards dealt
-            self.state.awaiting_card_deal = True
+            state.awaiting_card_deal = True
             
-        elif self.state.phase == GamePhase.RIVER:
+        elif state.phase == GamePhase.RIVER:
             # Before going to showdown, ensure we have all 5 community cards
-            if len(self.state.board_cards) != 5:
-                logger.error(f"ERROR: Trying to go to showdown with only {len(self.state.board_cards)} board cards!")
-                logger.error(f"Board: {self.state.board_cards}")
+            if len(state.board_cards) != 5:
+                logger.error("ERROR: Trying to go to showdown with only %s board cards!", len(state.board_cards))
+                logger.error("Board: %s", state.board_cards)
                 logger.error("PREVENTING SHOWDOWN - This is a critical error!")
                 # Don't go to showdown with incomplete board
                 return {"animations": animations}
             
             # Showdown - only if we have all cards
             logger.info("Moving to SHOWDOWN phase with complete board")
-            self.state.phase = GamePhase.SHOWDOWN
+            state.phase = GamePhase.SHOWDOWN
             # Calculate final pots before showdown
             self._calculate_pots()
             showdown_result = self._resolve_showdown()
@@ -871,86 +1009,87 @@ class PokerGame:
             
             # Record phase change time even for showdown
             self._last_phase_change = time.time()
-            logger.info(f"====== PHASE TRANSITION END - SHOWDOWN (took {time.time() - start_time:.3f}s) ======")
+            logger.info("====== PHASE TRANSITION END - SHOWDOWN (took %.3fs) ======", time.time() - start_time)
             
             return {"animations": animations}
         
-        elif self.state.phase == GamePhase.SHOWDOWN:
+        elif state.phase == GamePhase.SHOWDOWN:
             logger.error("ERROR: Trying to advance from SHOWDOWN phase!")
             return {"animations": []}
         
-        elif self.state.phase == GamePhase.GAME_OVER:
+        elif state.phase == GamePhase.GAME_OVER:
             logger.error("ERROR: Trying to advance from GAME_OVER phase!")
             return {"animations": []}
         
         # Set action to first active player
-        self.state.action_on = self._get_first_to_act_position()
-        logger.info(f"Action is now on position {self.state.action_on}")
+        state.action_on = self._get_first_to_act_position()
+        logger.info("Action is now on position %s", state.action_on)
         
         # Check if all players are all-in (no one can act)
-        if self.state.action_on == -1:
-            active_players = [p for p in self.state.players if not p.has_folded and p.stack > 0]
-            players_in_hand = [p for p in self.state.players if not p.has_folded]
+        if state.action_on == -1:
+            players_in_hand = self.get_players_in_hand()
+            active_players = [p for p in players_in_hand if p.stack > 0]
             
             # If all remaining players are all-in (including when one will bust the other)
             if len(active_players) == 0 and len(players_in_hand) > 1:
                 logger.info("All players are all-in - marking for turn-based card dealing")
                 
                 # Mark that all players are all-in
-                self.state.all_players_all_in = True
+                state.all_players_all_in = True
                 
                 # CRITICAL: Calculate pots NOW before phase transitions reset current_bet
                 logger.info("Calculating pots immediately for all-in situation")
                 self._calculate_pots()
-                logger.info(f"Pots calculated: {len(self.state.pots)} pots, total: ${sum(pot.amount for pot in self.state.pots)}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Pots calculated: %s pots, total: $%s", len(state.pots), sum(pot.amount for pot in state.pots))
                 
                 # Add a visual notification
-                animations.append({
-                    "type": "delay",
-                    "delay": 2000,
-                    "message": "All players all-in!"
-                })
+                animations.append(Animation(
+                    type="delay",
+                    delay=2000,
+                    message="All players all-in!"
+                ))
                 
                 # Tell frontend to request cards
-                animations.append({
-                    "type": "request_cards",
-                    "phase": self.state.phase.name,
-                    "delay": 1000
-                })
+                animations.append(Animation(
+                    type="request_cards",
+                    phase=state.phase.name,
+                    delay=1000
+                ))
                 
                 return {"animations": animations}
         
         # Double-check all players have last_action reset
-        for player in self.state.players:
-            if not player.has_folded and player.stack > 0:
-                logger.info(f"{player.name}: last_action={player.last_action}, current_bet={player.current_bet}")
+        if logger.isEnabledFor(logging.INFO):
+            for player in state.players:
+                if not player.has_folded and player.stack > 0:
+                    logger.info("%s: last_action=%s, current_bet=%s", player.name, player.last_action, player.current_bet)
         
         # Add phase transition sound
-        animations.append({
-            "type": "sound",
-            "sound": "card_flip",
-            "delay": 0
-        })
+        animations.append(Animation(
+            type="sound",
+            sound="card_flip",
+            delay=0
+        ))
         
         # If we're awaiting card deal, add animation to request cards
-        if self.state.awaiting_card_deal:
-            animations.append({
-                "type": "request_cards",
-                "phase": self.state.phase.name,
-                "delay": 1000
-            })
+        if state.awaiting_card_deal:
+            animations.append(Animation(
+                type="request_cards",
+                phase=state.phase.name,
+                delay=1000
+            ))
         
         # Update pot display but don't calculate pots yet
         # Just track total contributions for display purposes
-        pot_total = sum(pot.amount for pot in self.state.pots)
-        for player in self.state.players:
-            pot_total += player.total_bet_this_hand
-        logger.info(f"Current pot total for display: ${pot_total}")
+        if logger.isEnabledFor(logging.INFO):
+            pot_total = sum(pot.amount for pot in state.pots) + state.total_wagered
+            logger.info("Current pot total for display: $%s", pot_total)
         
         # Log phase transition for debugging
-        logger.info(f"Phase transition complete: {self.state.phase.name} with {len(self.state.board_cards)} board cards")
-        logger.info(f"Board cards: {self.state.board_cards}")
-        logger.info(f"====== PHASE TRANSITION END (took {time.time() - start_time:.3f}s) ======")
+        logger.info("Phase transition complete: %s with %s board cards", state.phase.name, len(state.board_cards))
+        logger.info("Board cards: %s", state.board_cards)
+        logger.info("====== PHASE TRANSITION END (took %.3fs) ======", time.time() - start_time)
         
         # Update last phase change time
         self._last_phase_change = time.time()
@@ -959,137 +1098,133 @@ class PokerGame:
     
     def deal_next_phase_cards(self) -> Dict[str, Any]:
         """Deal cards for the next phase when requested by frontend"""
-        logger.info(f"\n{'='*50}\nDEALING CARDS FOR PHASE: {self.state.phase.name}\n{'='*50}")
-        logger.info(f"Current state: awaiting_card_deal={self.state.awaiting_card_deal}, all_players_all_in={self.state.all_players_all_in}")
-        logger.info(f"Board cards: {self.state.board_cards} (count: {len(self.state.board_cards)})")
+        self._serialized_state = None
+        state = self.state
+        phase = state.phase
+        logger.info("\n%s\nDEALING CARDS FOR PHASE: %s\n%s", '='*50, phase.name, '='*50)
+        logger.info("Current state: awaiting_card_deal=%s, all_players_all_in=%s", state.awaiting_card_deal, state.all_players_all_in)
+        logger.info("Board cards: %s (count: %s)", state.board_cards, len(state.board_cards))
         
         animations = []
         
         # Check if cards have already been dealt for this phase
-        if self.state.cards_dealt_for_phase.get(self.state.phase, False):
-            logger.warning(f"Cards already dealt for phase {self.state.phase.name}")
+        if state.cards_dealt_mask & (1 << phase.value):
+            logger.warning("Cards already dealt for phase %s", phase.name)
             return {"success": False, "error": "Cards already dealt for this phase"}
         
         # Check if we should be dealing cards
-        if not self.state.awaiting_card_deal:
+        if not state.awaiting_card_deal:
             logger.warning("Not awaiting card deal")
             return {"success": False, "error": "Not awaiting card deal"}
         
         # Deal cards based on current phase
-        if self.state.phase == GamePhase.FLOP:
+        if phase == GamePhase.FLOP:
             # Deal flop (3 cards)
-            if len(self.state.board_cards) > 0:
-                logger.error(f"ERROR: Board already has {len(self.state.board_cards)} cards!")
+            if len(state.board_cards) > 0:
+                logger.error("ERROR: Board already has %s cards!", len(state.board_cards))
                 return {"success": False, "error": "Board already has cards"}
             
-            # Burn card
-            burn = self.state.deck.pop()
-            animations.append({"type": "burn_card", "delay": 0})
+            # Burn card, then deal 3 flop cards
+            burn, *flop = self._draw_cards(4)
+            animations.append(Animation(type="burn_card", delay=0))
             
-            # Deal 3 flop cards
-            for i in range(3):
-                card = self.state.deck.pop()
-                self.state.board_cards.append(card)
-                animations.append({
-                    "type": "deal_board_card",
-                    "card": card,
-                    "position": i,
-                    "delay": 500 + (i * 400)
-                })
+            state.board_cards.extend(flop)
+            animations.extend(
+                Animation(type="deal_board_card", card=card, position=i, delay=500 + (i * 400))
+                for i, card in enumerate(flop)
+            )
             
-            logger.info(f"Dealt flop: {self.state.board_cards}")
+            logger.info("Dealt flop: %s", state.board_cards)
             
-        elif self.state.phase == GamePhase.TURN:
+        elif phase == GamePhase.TURN:
             # Deal turn (1 card)
-            if len(self.state.board_cards) != 3:
-                logger.error(f"ERROR: Board has {len(self.state.board_cards)} cards, expected 3")
+            if len(state.board_cards) != 3:
+                logger.error("ERROR: Board has %s cards, expected 3", len(state.board_cards))
                 return {"success": False, "error": "Invalid board state"}
             
-            # Burn card
-            burn = self.state.deck.pop()
-            animations.append({"type": "burn_card", "delay": 0})
+            # Burn card, then deal turn card
+            burn, card = self._draw_cards(2)
+            animations.append(Animation(type="burn_card", delay=0))
             
-            # Deal turn card
-            card = self.state.deck.pop()
-            self.state.board_cards.append(card)
-            animations.append({
-                "type": "deal_board_card",
-                "card": card,
-                "position": 3,
-                "delay": 500
-            })
+            state.board_cards.append(card)
+            animations.append(Animation(
+                type="deal_board_card",
+                card=card,
+                position=3,
+                delay=500
+            ))
             
-            logger.info(f"Dealt turn: {card}")
+            logger.info("Dealt turn: %s", card)
             
-        elif self.state.phase == GamePhase.RIVER:
+        elif phase == GamePhase.RIVER:
             # Deal river (1 card)
-            if len(self.state.board_cards) != 4:
-                logger.error(f"ERROR: Board has {len(self.state.board_cards)} cards, expected 4")
+            if len(state.board_cards) != 4:
+                logger.error("ERROR: Board has %s cards, expected 4", len(state.board_cards))
                 return {"success": False, "error": "Invalid board state"}
             
-            # Burn card
-            burn = self.state.deck.pop()
-            animations.append({"type": "burn_card", "delay": 0})
+            # Burn card, then deal river card
+            burn, card = self._draw_cards(2)
+            animations.append(Animation(type="burn_card", delay=0))
             
-            # Deal river card
-            card = self.state.deck.pop()
-            self.state.board_cards.append(card)
-            animations.append({
-                "type": "deal_board_card",
-                "card": card,
-                "position": 4,
-                "delay": 500
-            })
+            state.board_cards.append(card)
+            animations.append(Animation(
+                type="deal_board_card",
+                card=card,
+                position=4,
+                delay=500
+            ))
             
-            logger.info(f"Dealt river: {card}")
+            logger.info("Dealt river: %s", card)
             
         else:
-            logger.error(f"Cannot deal cards in phase: {self.state.phase.name}")
-            return {"success": False, "error": f"Cannot deal cards in {self.state.phase.name} phase"}
+            logger.error("Cannot deal cards in phase: %s", phase.name)
+            return {"success": False, "error": f"Cannot deal cards in {phase.name} phase"}
         
         # Mark cards as dealt for this phase
-        self.state.cards_dealt_for_phase[self.state.phase] = True
-        self.state.awaiting_card_deal = False
+        state.cards_dealt_mask |= 1 << phase.value
+        state.awaiting_card_deal = False
         
         # If all players are all-in and we just dealt cards, check if we should continue
-        if self.state.all_players_all_in:
-            logger.info(f"All players all-in after dealing {self.state.phase.name} cards")
+        if state.all_players_all_in:
+            logger.info("All players all-in after dealing %s cards", phase.name)
             # Check if we need to advance to next phase
             # Add longer delays for dramatic effect when all-in
-            if self.state.phase == GamePhase.FLOP:
+            if phase == GamePhase.FLOP:
                 logger.info("Adding request_next_cards animation for TURN")
-                animations.append({
-                    "type": "request_next_cards",
-                    "phase": "TURN",
-                    "delay": 3500  # Increased from 2000ms
-                })
-            elif self.state.phase == GamePhase.TURN:
+                animations.append(Animation(
+                    type="request_next_cards",
+                    phase="TURN",
+                    delay=3500  # Increased from 2000ms
+                ))
+            elif phase == GamePhase.TURN:
                 logger.info("Adding request_next_cards animation for RIVER")
-                animations.append({
-                    "type": "request_next_cards", 
-                    "phase": "RIVER",
-                    "delay": 3500  # Increased from 2000ms
-                })
-            elif self.state.phase == GamePhase.RIVER:
+                animations.append(Animation(
+                    type="request_next_cards",
+                    phase="RIVER",
+                    delay=3500  # Increased from 2000ms
+                ))
+            elif phase == GamePhase.RIVER:
                 logger.info("Adding proceed_to_showdown animation")
                 # Time for showdown
-                animations.append({
-                    "type": "proceed_to_showdown",
-                    "delay": 4000  # Increased from 2000ms for final drama
-                })
+                animations.append(Animation(
+                    type="proceed_to_showdown",
+                    delay=4000  # Increased from 2000ms for final drama
+                ))
         
-        logger.info(f"Returning {len(animations)} animations from deal_next_phase_cards")
-        for anim in animations:
-            logger.info(f"  Animation: {anim}")
+        logger.info("Returning %s animations from deal_next_phase_cards", len(animations))
+        if logger.isEnabledFor(logging.INFO):
+            for anim in animations:
+                logger.info("  Animation: %s", anim)
         
         return {
             "success": True,
-            "animations": animations,
+            "animations": [a.to_dict() for a in animations],
             "state": self._serialize_state()
         }
     
     def advance_all_in_phase(self) -> Dict[str, Any]:
         """Advance to next phase when all players are all-in"""
+        self._serialized_state = None
         logger.info(f"Advancing all-in phase from {self.state.phase.name}")
         
         if not self.state.all_players_all_in:
@@ -1100,36 +1235,38 @@ class PokerGame:
         
         # Add request for next cards if needed
         if self.state.awaiting_card_deal:
-            result["animations"].append({
-                "type": "request_cards",
-                "phase": self.state.phase.name,
-                "delay": 1000
-            })
+            result["animations"].append(Animation(
+                type="request_cards",
+                phase=self.state.phase.name,
+                delay=1000
+            ))
         
         return {
             "success": True,
-            "animations": result["animations"],
+            "animations": [a.to_dict() for a in result["animations"]],
             "state": self._serialize_state()
         }
     
     def _resolve_showdown(self) -> Dict[str, Any]:
         """Resolve showdown and determine winners"""
-        logger.info(f"\n{'='*60}\nRESOLVING SHOWDOWN\n{'='*60}")
-        logger.info(f"Phase when showdown called: {self.state.phase.name}")
-        logger.info(f"Board cards: {self.state.board_cards} (count: {len(self.state.board_cards)})")
+        state = self.state
+        logger.info("\n%s\nRESOLVING SHOWDOWN\n%s", '='*60, '='*60)
+        logger.info("Phase when showdown called: %s", state.phase.name)
+        logger.info("Board cards: %s (count: %s)", state.board_cards, len(state.board_cards))
         
         # CRITICAL CHECK: Ensure we're actually ready for showdown
-        if self.state.phase != GamePhase.SHOWDOWN and self.state.phase != GamePhase.GAME_OVER:
-            logger.error(f"ERROR: _resolve_showdown called during {self.state.phase.name} phase!")
+        if state.phase != GamePhase.SHOWDOWN and state.phase != GamePhase.GAME_OVER:
+            logger.error("ERROR: _resolve_showdown called during %s phase!", state.phase.name)
             logger.error("This should never happen!")
             return {"animations": []}
         
         # Check if pots have already been cleared (showdown already resolved)
-        if not self.state.pots or sum(pot.amount for pot in self.state.pots) == 0:
+        if not state.pots or sum(pot.amount for pot in state.pots) == 0:
             logger.warning("Showdown already resolved - no pots to award")
             return {"animations": []}
         
         animations = []
+        winner_info: Dict[str, Tuple[int, str]] = {}  # player id -> (amount won, winning hand)
         active_players = self.get_players_in_hand()
         
         # If only one player remains (others folded), they win all pots they're eligible for
@@ -1138,193 +1275,198 @@ class PokerGame:
             total_won = 0
             
             # Award all pots the winner is eligible for
-            for pot in self.state.pots:
+            for pot in state.pots:
                 if winner.id in pot.eligible_players:
-                    logger.info(f"Before awarding pot: {winner.name} stack=${winner.stack}")
+                    logger.info("Before awarding pot: %s stack=$%s", winner.name, winner.stack)
                     stack_before = winner.stack
                     winner.stack += pot.amount
                     total_won += pot.amount
-                    logger.info(f"{winner.name} wins pot of ${pot.amount}")
-                    logger.info(f"After awarding pot: {winner.name} stack=${winner.stack}")
+                    logger.info("%s wins pot of $%s", winner.name, pot.amount)
+                    logger.info("After awarding pot: %s stack=$%s", winner.name, winner.stack)
                     # Record chip movement
-                    self._record_chip_movement(winner.id, pot.amount, "pot_won_fold", stack_before)
+                    self._record_chip_movement(winner, pot.amount, "pot_won_fold", stack_before)
             
             if total_won > 0:
                 # Track winner info for hand history
-                winner._won_amount = total_won
-                winner._winning_hand = "All opponents folded"
+                winner_info[winner.id] = (total_won, "All opponents folded")
                 
-                animations.append({
-                    "type": "award_pot",
-                    "winner_id": winner.id,
-                    "amount": total_won,
-                    "delay": 500,
-                    "stack_before_win": winner.stack - total_won  # Include pre-win stack
-                })
+                animations.append(Animation(
+                    type="award_pot",
+                    winner_id=winner.id,
+                    amount=total_won,
+                    delay=500,
+                    stack_before_win=winner.stack - total_won  # Include pre-win stack
+                ))
             else:
                 logger.warning("No pots to award - this shouldn't happen!")
         else:
             # Show all hands with animation
             for i, player in enumerate(active_players):
                 if player.is_ai:  # Only reveal AI hands
-                    animations.append({
-                        "type": "reveal_cards",
-                        "player_id": player.id,
-                        "cards": player.hole_cards,
-                        "delay": i * 500
-                    })
+                    animations.append(Animation(
+                        type="reveal_cards",
+                        player_id=player.id,
+                        cards=player.hole_cards,
+                        delay=i * 500
+                    ))
             
             # CRITICAL: Only evaluate hands if we have a complete board (5 cards)
             # This prevents premature hand evaluation during all-in situations
-            if len(self.state.board_cards) < 5:
-                logger.error(f"ERROR: Attempting to evaluate hands with incomplete board! Only {len(self.state.board_cards)} cards dealt!")
-                logger.error(f"Board: {self.state.board_cards}")
+            if len(state.board_cards) < 5:
+                logger.error("ERROR: Attempting to evaluate hands with incomplete board! Only %s cards dealt!", len(state.board_cards))
+                logger.error("Board: %s", state.board_cards)
                 logger.error("This should never happen - showdown should only occur after river!")
                 # Don't evaluate - return empty animations
                 return {"animations": []}
             
             # Evaluate hands and determine winners for each pot
             delay = len(active_players) * 500 + 1000
+            biggest_winner_id = None
+            biggest_winnings = 0
             
-            # Keep track of total winnings for celebration animation
-            player_winnings = {p.id: 0 for p in active_players}
+            # Parse the board and every hand once, shared by all the pots below
+            board = tuple(parse_card(c) for c in state.board_cards)
+            parsed_hole_cards = {p.id: tuple(parse_card(c) for c in p.hole_cards) for p in active_players}
             
-            for i, pot in enumerate(self.state.pots):
-                # Get eligible players for this pot
-                eligible_in_pot = [p for p in active_players if p.id in pot.eligible_players]
+            for i, pot in enumerate(state.pots):
+                # Get eligible players for this pot, keyed by id for winner lookups
+                eligible_in_pot = {p.id: p for p in active_players if p.id in pot.eligible_players}
                 
                 if eligible_in_pot:
                     # Build hole cards dict for eligible players
-                    hole_cards_dict = {p.id: p.hole_cards for p in eligible_in_pot}
+                    hole_cards_dict = {p_id: parsed_hole_cards[p_id] for p_id in eligible_in_pot}
                     
                     # Get winners using hand evaluator
-                    winner_ids, evaluations = get_winning_players(hole_cards_dict, self.state.board_cards)
+                    winner_ids, evaluations = get_winning_players_preparsed(hole_cards_dict, board)
                     
                     # Log hand evaluations
-                    for player_id, hand_eval in evaluations.items():
-                        player = next(p for p in eligible_in_pot if p.id == player_id)
-                        logger.info(f"{player.name} has {hand_eval}")
+                    if logger.isEnabledFor(logging.INFO):
+                        for player_id, hand_eval in evaluations.items():
+                            logger.info("%s has %s", eligible_in_pot[player_id].name, hand_eval)
                     
                     # Split pot among winners
                     split_amount = pot.amount // len(winner_ids)
                     remainder = pot.amount % len(winner_ids)
                     
                     for j, winner_id in enumerate(winner_ids):
-                        winner = next(p for p in eligible_in_pot if p.id == winner_id)
+                        winner = eligible_in_pot[winner_id]
                         # First winner gets any remainder from integer division
                         award_amount = split_amount + (remainder if j == 0 else 0)
                         stack_before = winner.stack
                         winner.stack += award_amount
-                        player_winnings[winner_id] += award_amount
                         # Record chip movement
-                        self._record_chip_movement(winner_id, award_amount, f"pot_{i+1}_won_showdown", stack_before)
+                        self._record_chip_movement(winner, award_amount, f"pot_{i+1}_won_showdown", stack_before)
                         
                         # Track winner info for hand history
-                        if not hasattr(winner, '_won_amount'):
-                            winner._won_amount = 0
-                            winner._winning_hand = evaluations[winner_id].name
-                        winner._won_amount += award_amount
+                        won_so_far, winning_hand = winner_info.get(winner_id, (0, evaluations[winner_id].name))
+                        winner_info[winner_id] = (won_so_far + award_amount, winning_hand)
+                        if won_so_far + award_amount > biggest_winnings:
+                            biggest_winner_id = winner_id
+                            biggest_winnings = won_so_far + award_amount
                         
-                        animations.append({
-                            "type": "award_pot",
-                            "winner_id": winner_id,
-                            "amount": award_amount,
-                            "pot_number": i + 1,
-                            "delay": delay,
-                            "hand_name": evaluations[winner_id].name,
-                            "stack_before_win": winner.stack - award_amount  # Include pre-win stack
-                        })
+                        animations.append(Animation(
+                            type="award_pot",
+                            winner_id=winner_id,
+                            amount=award_amount,
+                            pot_number=i + 1,
+                            delay=delay,
+                            hand_name=evaluations[winner_id].name,
+                            stack_before_win=winner.stack - award_amount  # Include pre-win stack
+                        ))
                         
                         if len(winner_ids) > 1:
-                            logger.info(f"{winner.name} wins ${award_amount} from pot {i+1} (split pot)")
+                            logger.info("%s wins $%s from pot %s (split pot)", winner.name, award_amount, i+1)
                         else:
-                            logger.info(f"{winner.name} wins pot {i+1} of ${award_amount} with {evaluations[winner_id]}")
+                            logger.info("%s wins pot %s of $%s with %s", winner.name, i+1, award_amount, evaluations[winner_id])
                     
                     delay += 1000
             
             # Celebration for biggest winner
-            if player_winnings:
-                biggest_winner_id = max(player_winnings.items(), key=lambda x: x[1])[0]
-                if player_winnings[biggest_winner_id] > 0:
-                    animations.append({
-                        "type": "celebration",
-                        "winner_id": biggest_winner_id,
-                        "delay": delay
-                    })
+            if biggest_winner_id is not None:
+                animations.append(Animation(
+                    type="celebration",
+                    winner_id=biggest_winner_id,
+                    delay=delay
+                ))
         
         # DON'T set phase to GAME_OVER yet - let animations play first
-        # self.state.phase = GamePhase.GAME_OVER  # REMOVED - causes premature game over screen
-        logger.info(f"\n{'='*60}\nHAND COMPLETE - STAYING IN SHOWDOWN PHASE\n{'='*60}")
-        logger.info(f"Final board: {self.state.board_cards}")
+        # state.phase = GamePhase.GAME_OVER  # REMOVED - causes premature game over screen
+        logger.info("\n%s\nHAND COMPLETE - STAYING IN SHOWDOWN PHASE\n%s", '='*60, '='*60)
+        logger.info("Final board: %s", state.board_cards)
         
         # Log final player stacks
         busted_players = []
         total_chips_end = 0
-        for player in self.state.players:
-            logger.info(f"{player.name} final stack: ${player.stack}")
+        for player in state.players:
+            logger.info("%s final stack: $%s", player.name, player.stack)
             total_chips_end += player.stack
             if player.stack == 0:
                 busted_players.append(player)
         
-        # Validate chip integrity
-        expected_total = self.config['heroStack'] * self.config['bigBlind']
-        for stack in self.config['opponentStacks']:
-            expected_total += stack * self.config['bigBlind']
-        
-        if total_chips_end != expected_total:
-            logger.error(f"CHIP INTEGRITY ERROR: Expected ${expected_total} total chips, but found ${total_chips_end}!")
-            logger.error(f"Difference: ${total_chips_end - expected_total} extra chips created!")
+        # Validate chip integrity (only when debug validation is enabled)
+        expected_total = self._expected_total_chips
+        if self._debug and total_chips_end != expected_total:
+            logger.error("CHIP INTEGRITY ERROR: Expected $%s total chips, but found $%s!", expected_total, total_chips_end)
+            logger.error("Difference: $%s extra chips created!", total_chips_end - expected_total)
         
         # If someone got busted, add extra delay so players can see why
         if busted_players:
-            logger.info(f"Player(s) busted: {[p.name for p in busted_players]}")
+            logger.info("Player(s) busted: %s", [p.name for p in busted_players])
             # Add a longer delay with a clear message about who won and why
             busted_names = ", ".join([p.name for p in busted_players])
             # Calculate total animation time to ensure board is visible
-            total_animation_time = sum(a.get('delay', 0) for a in animations)
-            animations.append({
-                "type": "delay",
-                "delay": max(6000, total_animation_time + 3000),  # Ensure enough time to see board
-                "message": f"{busted_names} eliminated! Final board shown above."
-            })
+            total_animation_time = sum(a.delay for a in animations)
+            animations.append(Animation(
+                type="delay",
+                delay=max(6000, total_animation_time + 3000),  # Ensure enough time to see board
+                message=f"{busted_names} eliminated! Final board shown above."
+            ))
         
         # Add a final animation to signal hand is complete
-        animations.append({
-            "type": "hand_complete",
-            "delay": 500
-        })
+        animations.append(Animation(
+            type="hand_complete",
+            delay=500
+        ))
         
         # Record hand history
-        self._record_hand_history()
+        self._record_hand_history(winner_info)
         
         # Clear pots to prevent double-awarding
-        self.state.pots = []
+        state.pots = []
         
         # Clear all player bets
-        for p in self.state.players:
-            p.total_bet_this_hand = 0
-            p.current_bet = 0
+        state.clear_bets()
         
         return {"animations": animations}
     
+    def _draw_cards(self, count: int) -> List[str]:
+        """Deal the next count cards from the deck by advancing the cursor"""
+        start = self.state.deck_cursor
+        self.state.deck_cursor = start + count
+        return self.state.deck[start:start + count]
+    
     def _place_bet(self, player: Player, amount: int):
         """Place a bet for a player"""
         actual_bet = min(amount, player.stack)
         
-        logger.info(f"_place_bet: {player.name} betting ${actual_bet} (requested ${amount})")
-        logger.info(f"Before: stack=${player.stack}, current_bet=${player.current_bet}")
-        
         # Record state before the bet
         stack_before = player.stack
         
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("_place_bet: %s betting $%s (requested $%s)", player.name, actual_bet, amount)
+            logger.info("Before: stack=$%s, current_bet=$%s", player.stack, player.current_bet)
+        
         player.stack -= actual_bet
         player.current_bet += actual_bet
         player.total_bet_this_hand += actual_bet
+        self.state.total_wagered += actual_bet
         
-        logger.info(f"After: stack=${player.stack}, current_bet=${player.current_bet}, total_bet_this_hand=${player.total_bet_this_hand}")
+        if log_info:
+            logger.info("After: stack=$%s, current_bet=$%s, total_bet_this_hand=$%s", player.stack, player.current_bet, player.total_bet_this_hand)
         
         # Record chip movement
-        self._record_chip_movement(player.id, -actual_bet, f"bet_{self.state.phase.name}", stack_before)
+        self._record_chip_movement(player, -actual_bet, f"bet_{self.state.phase.name}", stack_before)
         
         # Don't add to pot here - we'll calculate pots when betting round ends
         # This allows proper side pot calculation
@@ -1336,11 +1478,11 @@ class PokerGame:
         players_in_hand = self.get_players_in_hand()
         active_players = [p for p in players_in_hand if p.stack > 0]  # Can still act
         
-        logger.info(f"\n{'*'*50}\nBETTING ROUND COMPLETION CHECK\n{'*'*50}")
-        logger.info(f"Phase: {self.state.phase.name}")
-        logger.info(f"Current table bet: ${self.state.current_bet}")
-        logger.info(f"Players in hand: {len(players_in_hand)} (includes all-in)")
-        logger.info(f"Players who can act: {len(active_players)} (have chips)")
+        logger.info("\n%s\nBETTING ROUND COMPLETION CHECK\n%s", '*'*50, '*'*50)
+        logger.info("Phase: %s", self.state.phase.name)
+        logger.info("Current table bet: $%s", self.state.current_bet)
+        logger.info("Players in hand: %s (includes all-in)", len(players_in_hand))
+        logger.info("Players who can act: %s (have chips)", len(active_players))
         
         # If everyone has folded except one player, round is complete
         if len(players_in_hand) <= 1:
@@ -1351,7 +1493,21 @@ class PokerGame:
         if len(active_players) == 0:
             logger.info("All players are all-in - round complete")
             return True
-        
+
+        # Fast path: a single player with chips only has to have acted and matched the bet
+        if len(active_players) == 1:
+            player = active_players[0]
+            is_complete = player.last_action is not None and player.current_bet >= self.state.current_bet
+            logger.info("Only %s can act - round complete: %s", player.name, is_complete)
+            return is_complete
+
+        # Heads-up: both players only have to have acted and matched the bet
+        if len(active_players) == 2:
+            is_complete = all(p.last_action is not None and p.current_bet >= self.state.current_bet
+                              for p in active_players)
+            logger.info("Heads-up - round complete: %s", is_complete)
+            return is_complete
+
         # For a betting round to be complete, ALL active players must have:
         # 1. Acted at least once (last_action != None) AND
         # 2. Either matched the current bet OR are all-in
@@ -1366,46 +1522,38 @@ class PokerGame:
                 highest_bet = player.current_bet
                 highest_bet_player = player.name
         
-        logger.info(f"Highest bet: ${highest_bet} by {highest_bet_player}")
+        logger.info("Highest bet: $%s by %s", highest_bet, highest_bet_player)
         
         # Now check each player who can still act
         for player in active_players:  # Only check those with chips
             # All-in players don't need to act
             if player.stack == 0:
-                logger.info(f"{player.name}: All-in (stack=0) - no action needed")
+                logger.info("%s: All-in (stack=0) - no action needed", player.name)
                 continue
             
-            # Player needs to act if they haven't acted yet
+            # Player needs to act if they haven't acted yet (posting a blind is not an
+            # action, so this also gives the big blind its pre-flop option)
             if player.last_action is None:
                 players_who_need_to_act += 1
-                logger.info(f"{player.name}: Hasn't acted yet (last_action=None) - NEEDS TO ACT")
+                logger.info("%s: Hasn't acted yet (last_action=None) - NEEDS TO ACT", player.name)
                 continue
             
             # Player needs to act if they haven't matched the current bet
             if player.current_bet < self.state.current_bet:
                 players_who_need_to_act += 1
-                logger.info(f"{player.name}: Bet ${player.current_bet} < table bet ${self.state.current_bet} - NEEDS TO ACT")
+                logger.info("%s: Bet $%s < table bet $%s - NEEDS TO ACT", player.name, player.current_bet, self.state.current_bet)
                 continue
             
-            # Special case: In pre-flop, big blind gets option to raise even if matched
-            if (self.state.phase == GamePhase.PRE_FLOP and 
-                player.position == self._get_big_blind_position() and 
-                player == highest_bet_player and
-                player.last_action is None):
-                players_who_need_to_act += 1
-                logger.info(f"{player.name}: Big blind option to raise - NEEDS TO ACT")
-                continue
-            
-            logger.info(f"{player.name}: Has acted and matched bet - no action needed")
+            logger.info("%s: Has acted and matched bet - no action needed", player.name)
         
-        logger.info(f"\nSUMMARY:")
-        logger.info(f"  Players who need to act: {players_who_need_to_act}")
-        logger.info(f"  Betting round complete: {players_who_need_to_act == 0}")
+        logger.info("\nSUMMARY:")
+        logger.info("  Players who need to act: %s", players_who_need_to_act)
+        logger.info("  Betting round complete: %s", players_who_need_to_act == 0)
         
         if players_who_need_to_act == 0 and self.state.current_bet > 0:
-            logger.info(f"  All players have matched the bet of ${self.state.current_bet}")
+            logger.info("  All players have matched the bet of $%s", self.state.current_bet)
         
-        logger.info(f"{'*'*50}\n")
+        logger.info("%s\n", '*'*50)
         
         return players_who_need_to_act == 0
     
@@ -1419,11 +1567,11 @@ class PokerGame:
         
         # If pots already exist (e.g., calculated during all-in), don't recalculate
         if self.state.pots and sum(pot.amount for pot in self.state.pots) > 0:
-            logger.info(f"Pots already calculated: {len(self.state.pots)} pots, total ${sum(pot.amount for pot in self.state.pots)}")
+            logger.info("Pots already calculated: %s pots, total $%s", len(self.state.pots), sum(pot.amount for pot in self.state.pots))
             return
         
         # First check if everyone folded to one player
-        remaining_players = [p for p in self.state.players if not p.has_folded]
+        remaining_players = self.get_players_in_hand()
         if len(remaining_players) == 1:
             # Everyone else folded - handle uncalled bets
             winner = remaining_players[0]
@@ -1435,25 +1583,27 @@ class PokerGame:
                 
                 # Winner collects the called amount from all players
                 pot_size = 0
+                log_info = logger.isEnabledFor(logging.INFO)
                 for p in self.state.players:
                     # Each player contributes up to the max called amount
                     contribution = min(p.total_bet_this_hand, max_called)
                     pot_size += contribution
-                    logger.info(f"  {p.name} contributes ${contribution} to pot (bet ${p.total_bet_this_hand})")
+                    if log_info:
+                        logger.info("  %s contributes $%s to pot (bet $%s)", p.name, contribution, p.total_bet_this_hand)
                 
                 # Create pot with only the called amounts
                 self.state.pots = [Pot(amount=pot_size, eligible_players=[winner.id])]
-                logger.info(f"Everyone folded. Pot: ${pot_size} (max called: ${max_called})")
+                logger.info("Everyone folded. Pot: $%s (max called: $%s)", pot_size, max_called)
                 
                 # Return uncalled portion to the winner IMMEDIATELY
                 uncalled = winner.total_bet_this_hand - max_called
                 if uncalled > 0:
                     stack_before = winner.stack
                     winner.stack += uncalled
-                    logger.info(f"Returned uncalled bet of ${uncalled} to {winner.name}")
-                    logger.info(f"{winner.name} stack after uncalled return: ${winner.stack}")
+                    logger.info("Returned uncalled bet of $%s to %s", uncalled, winner.name)
+                    logger.info("%s stack after uncalled return: $%s", winner.name, winner.stack)
                     # Record chip movement
-                    self._record_chip_movement(winner.id, uncalled, "uncalled_bet_return", stack_before)
+                    self._record_chip_movement(winner, uncalled, "uncalled_bet_return", stack_before)
                 
                 # Don't clear bets yet - they're needed for pot awarding
                 # Will be cleared after pot is awarded
@@ -1464,129 +1614,102 @@ class PokerGame:
                 stack_before = winner.stack
                 winner.stack += winner.total_bet_this_hand
                 # Record chip movement
-                self._record_chip_movement(winner.id, winner.total_bet_this_hand, "own_bet_return", stack_before)
-                logger.info(f"No callers. Returned ${winner.total_bet_this_hand} to {winner.name}")
+                self._record_chip_movement(winner, winner.total_bet_this_hand, "own_bet_return", stack_before)
+                logger.info("No callers. Returned $%s to %s", winner.total_bet_this_hand, winner.name)
                 # Clear all bets
                 for p in self.state.players:
                     p.total_bet_this_hand = 0
+                self.state.total_wagered = 0
             return
         
-        # Get all unique bet amounts from players who haven't folded
-        bet_amounts = []
-        for p in self.state.players:
-            # Use total_bet_this_hand to get total contributions for the entire hand
-            if p.total_bet_this_hand > 0 and not p.has_folded:
-                if p.total_bet_this_hand not in bet_amounts:
-                    bet_amounts.append(p.total_bet_this_hand)
-                logger.info(f"  {p.name}: total bet this hand ${p.total_bet_this_hand}, folded={p.has_folded}")
-        
-        # Sort bet amounts ascending
-        bet_amounts.sort()
+        # Get all unique bet amounts from players who haven't folded, sorted ascending
+        # Use total_bet_this_hand to get total contributions for the entire hand
+        contenders = [p for p in self.state.players if p.total_bet_this_hand > 0 and not p.has_folded]
+        bet_amounts = sorted({p.total_bet_this_hand for p in contenders})
+        if logger.isEnabledFor(logging.INFO):
+            for p in contenders:
+                logger.info("  %s: total bet this hand $%s, folded=%s", p.name, p.total_bet_this_hand, p.has_folded)
         
         # Clear existing pots and recalculate
         self.state.pots = []
         previous_level = 0
         
+        # Read each player's contribution once rather than once per pot level
+        bets = [p.total_bet_this_hand for p in self.state.players]
+        contender_bets = [(p.id, p.total_bet_this_hand) for p in contenders]
+        
         for bet_level in bet_amounts:
-            pot_amount = 0
-            eligible_players = []
+            # Every player contributes the difference between levels, up to their total bet
+            layer = bet_level - previous_level
+            pot_amount = sum(min(layer, bet - previous_level) for bet in bets if bet > previous_level)
             
-            # Calculate contributions for this pot level
-            for p in self.state.players:
-                if p.total_bet_this_hand > previous_level:
-                    # Player contributes the difference between levels, up to their total bet
-                    contribution = min(bet_level - previous_level, p.total_bet_this_hand - previous_level)
-                    pot_amount += contribution
-                    
-                    # Player is eligible if they haven't folded and bet at least this level
-                    if not p.has_folded and p.total_bet_this_hand >= bet_level:
-                        eligible_players.append(p.id)
+            # Player is eligible if they haven't folded and bet at least this level
+            eligible_players = [player_id for player_id, bet in contender_bets if bet >= bet_level]
             
             if pot_amount > 0 and eligible_players:
                 pot = Pot(amount=pot_amount, eligible_players=eligible_players)
                 self.state.pots.append(pot)
-                logger.info(f"Pot {len(self.state.pots)}: ${pot_amount} - Eligible: {eligible_players}")
+                logger.info("Pot %s: $%s - Eligible: %s", len(self.state.pots), pot_amount, eligible_players)
             
             previous_level = bet_level
         
         # Log total pot info
         total_pot = sum(pot.amount for pot in self.state.pots)
-        logger.info(f"Total pots: {len(self.state.pots)}, Total amount: ${total_pot}")
+        logger.info("Total pots: %s, Total amount: $%s", len(self.state.pots), total_pot)
+        
+        # The remaining checks only run when debug validation is enabled
+        if not self._debug:
+            return
         
         # Validate pot total
-        total_chips_in_play = sum(p.stack for p in self.state.players) + sum(p.total_bet_this_hand for p in self.state.players)
+        total_bets = sum(p.total_bet_this_hand for p in self.state.players)
+        total_chips_in_play = sum(p.stack for p in self.state.players) + total_bets
         if total_pot > total_chips_in_play:
-            logger.error(f"ERROR: Pot total ${total_pot} exceeds total chips in play ${total_chips_in_play}!")
+            logger.error("ERROR: Pot total $%s exceeds total chips in play $%s!", total_pot, total_chips_in_play)
             logger.error("This indicates a serious bug in pot calculation!")
         
         # Also validate against expected total from config
-        expected_total = self.config['heroStack'] * self.config['bigBlind']
-        for stack in self.config['opponentStacks']:
-            expected_total += stack * self.config['bigBlind']
+        expected_total = self._expected_total_chips
+        
+        if total_pot != total_bets:
+            logger.error("ERROR: Pot total $%s doesn't match sum of bets $%s!", total_pot, total_bets)
         
-        if total_pot != sum(p.total_bet_this_hand for p in self.state.players):
-            logger.error(f"ERROR: Pot total ${total_pot} doesn't match sum of bets ${sum(p.total_bet_this_hand for p in self.state.players)}!")
+        if total_bets != self.state.total_wagered:
+            logger.error("ERROR: Running bet total $%s doesn't match sum of bets $%s!", self.state.total_wagered, total_bets)
         
         if total_chips_in_play != expected_total:
-            logger.error(f"CHIP INTEGRITY ERROR in pot calculation: Expected ${expected_total} total chips, but found ${total_chips_in_play}!")
-            logger.error(f"Player details:")
+            logger.error("CHIP INTEGRITY ERROR in pot calculation: Expected $%s total chips, but found $%s!", expected_total, total_chips_in_play)
+            logger.error("Player details:")
             for p in self.state.players:
-                logger.error(f"  {p.name}: stack=${p.stack}, total_bet_this_hand=${p.total_bet_this_hand}")
+                logger.error("  %s: stack=$%s, total_bet_this_hand=$%s", p.name, p.stack, p.total_bet_this_hand)
     
-    def _get_small_blind_position(self) -> int:
-        """Get small blind position"""
-        active_players = [p for p in self.state.players if p.stack > 0]
-        if len(active_players) <= 2:
-            # Heads up: dealer is small blind
-            return self.state.dealer_position
-        
-        # Find next active player after dealer
-        n = len(self.state.players)
-        for i in range(1, n + 1):
-            pos = (self.state.dealer_position + i) % n
-            if self.state.players[pos].stack > 0:
-                return pos
-        return self.state.dealer_position
-    
-    def _get_big_blind_position(self) -> int:
-        """Get big blind position"""
-        active_players = [p for p in self.state.players if p.stack > 0]
-        if len(active_players) <= 2:
-            # Heads up: non-dealer is big blind
-            n = len(self.state.players)
-            for i in range(1, n + 1):
-                pos = (self.state.dealer_position + i) % n
-                if self.state.players[pos].stack > 0:
-                    return pos
-        
-        # Find second active player after dealer
-        n = len(self.state.players)
-        active_count = 0
-        for i in range(1, n + 1):
-            pos = (self.state.dealer_position + i) % n
-            if self.state.players[pos].stack > 0:
-                active_count += 1
-                if active_count == 2:
-                    return pos
-        return self.state.dealer_position
+    def _compute_blind_positions(self) -> Tuple[int, int]:
+        """Get the small and big blind positions for the current button in one pass over the seats"""
+        dealer = self.state.dealer_position
+        # Seats with chips, clockwise from the seat after the button and ending on it
+        seated = [pos for pos in self.state.seats_after(dealer) if self.state.players[pos].stack > 0]
+        if len(seated) <= 2:
+            # Heads up: dealer is small blind, the next player with chips is big blind
+            return dealer, (seated[0] if seated else dealer)
+        return seated[0], seated[1]
     
     def _get_first_to_act_position(self) -> int:
         """Get first to act position for current phase"""
-        if self.state.phase == GamePhase.PRE_FLOP:
+        state = self.state
+        if state.phase == GamePhase.PRE_FLOP:
             # Pre-flop: first after big blind
-            start = (self._get_big_blind_position() + 1) % len(self.state.players)
-            logger.info(f"PRE_FLOP: Looking for first to act after BB position {self._get_big_blind_position()}")
+            after = state.bb_position
+            logger.info("PRE_FLOP: Looking for first to act after BB position %s", after)
         else:
             # Post-flop: first after dealer
-            start = (self.state.dealer_position + 1) % len(self.state.players)
-            logger.info(f"POST_FLOP ({self.state.phase.name}): Looking for first to act after dealer position {self.state.dealer_position}")
-        
-        # Find first active player from start position
-        for i in range(len(self.state.players)):
-            pos = (start + i) % len(self.state.players)
-            player = self.state.players[pos]
-            if not player.has_folded and player.stack > 0:
-                logger.info(f"First to act: {player.name} at position {pos}")
+            after = state.dealer_position
+            logger.info("POST_FLOP (%s): Looking for first to act after dealer position %s", state.phase.name, after)
+        
+        # Find first active player clockwise from there, skipping folded seats by mask
+        mask = state.in_hand_mask
+        for pos in state.seats_after(after):
+            if (mask >> pos) & 1 and state.players[pos].stack > 0:
+                logger.info("First to act: %s at position %s", state.players[pos].name, pos)
                 return pos
         
         # This is normal when all players are all-in
@@ -1597,21 +1720,24 @@ class PokerGame:
         """Get next active player position"""
         return self.state.get_next_active_position(current)
     
-    def _get_next_active_dealer_position(self) -> int:
-        """Get next dealer position, skipping players with no chips"""
-        n = len(self.state.players)
-        for i in range(1, n + 1):
-            next_pos = (self.state.dealer_position + i) % n
-            if self.state.players[next_pos].stack > 0:
-                return next_pos
-        return self.state.dealer_position  # Shouldn't happen if game continues
+    def _compute_hand_positions(self) -> Tuple[int, int, int]:
+        """Get the next dealer, small blind and big blind positions in one pass over the seats"""
+        # Seats with chips, clockwise from the seat after the current button
+        seated = [pos for pos in self.state.seats_after(self.state.dealer_position)
+                  if self.state.players[pos].stack > 0]
+        if not seated:
+            # Shouldn't happen if game continues
+            return self.state.dealer_position, self.state.dealer_position, self.state.dealer_position
+        dealer = seated[0]
+        if len(seated) <= 2:
+            # Heads up: dealer is small blind, the other player is big blind
+            other = seated[1] if len(seated) == 2 else dealer
+            return dealer, dealer, other
+        return dealer, seated[1], seated[2]
     
     def _get_player_by_id(self, player_id: str) -> Optional[Player]:
         """Get player by ID"""
-        for player in self.state.players:
-            if player.id == player_id:
-                return player
-        return None
+        return self.state.get_player(player_id)
     
     def get_players_in_hand(self) -> List[Player]:
         """Get all players still in the hand"""
@@ -1621,16 +1747,21 @@ class PokerGame:
         """Get all active players"""
         return self.state.get_active_players()
     
-    def _record_hand_history(self):
-        """Record the completed hand in history"""
+    def _record_hand_history(self, winner_info: Dict[str, Tuple[int, str]]):
+        """Record the completed hand in history
+        
+        winner_info maps the id of each player who won chips to (amount won, winning hand).
+        """
+        # Card and eligibility lists are shared rather than copied: a new hand replaces
+        # them with fresh lists instead of mutating the ones recorded here
         hand_record = {
             "hand_number": self.state.hand_number,
             "timestamp": datetime.now().isoformat(),
-            "board_cards": self.state.board_cards.copy(),
+            "board_cards": self.state.board_cards,
             "pots": [
                 {
                     "amount": pot.amount,
-                    "eligible_players": pot.eligible_players.copy()
+                    "eligible_players": pot.eligible_players
                 }
                 for pot in self.state.pots
             ],
@@ -1638,24 +1769,26 @@ class PokerGame:
         }
         
         # Record each player's final state
+        dealer_position = self.state.dealer_position
+        sb_position = self.state.sb_position
+        bb_position = self.state.bb_position
         for player in self.state.players:
             player_record = {
                 "id": player.id,
                 "name": player.name,
                 "position": player.position,
-                "hole_cards": player.hole_cards.copy() if player.hole_cards else [],
+                "hole_cards": player.hole_cards,
                 "final_stack": player.stack,
                 "total_bet": player.total_bet_this_hand,
                 "folded": player.has_folded,
-                "is_dealer": player.position == self.state.dealer_position,
-                "is_small_blind": player.position == self._get_small_blind_position(),
-                "is_big_blind": player.position == self._get_big_blind_position()
+                "is_dealer": player.position == dealer_position,
+                "is_small_blind": player.position == sb_position,
+                "is_big_blind": player.position == bb_position
             }
             
             # Add winner information if available
-            if hasattr(player, '_won_amount'):
-                player_record["won_amount"] = player._won_amount
-                player_record["winning_hand"] = player._winning_hand
+            if player.id in winner_info:
+                player_record["won_amount"], player_record["winning_hand"] = winner_info[player.id]
             
             hand_record["players"].append(player_record)
         
@@ -1673,20 +1806,47 @@ class PokerGame:
             else:
                 logger.info(f"  {p['name']} lost with {' '.join(p['hole_cards'])}")
     
-    def get_hand_history(self) -> List[Dict[str, Any]]:
+    def enable_debug(self, enabled: bool = True):
+        """Turn full state validation before and after every action on or off"""
+        self._debug = enabled
+        logger.info(f"State validation {'enabled' if enabled else 'disabled'} for {self.game_id}")
+    
+    def get_hand_history(self) -> Tuple[Dict[str, Any], ...]:
         """Get the complete hand history"""
-        return self.hand_history.copy()
+        return tuple(self.hand_history)
+    
+    def _get_cached_request(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a request, expiring it lazily once past its TTL"""
+        entry = self._processed_requests.get(request_id)
+        if entry is None:
+            return None
+        timestamp, result = entry
+        if time.monotonic() - timestamp > self._request_cache_ttl:
+            del self._processed_requests[request_id]
+            logger.debug(f"Cleaned up expired request: {request_id}")
+            return None
+        return result
     
-    def _cleanup_request_cache(self):
-        """Remove expired requests from cache"""
-        current_time = time.time()
-        expired_requests = [
-            req_id for req_id, (timestamp, _) in self._processed_requests.items()
-            if current_time - timestamp > self._request_cache_ttl
-        ]
-        for req_id in expired_requests:
-            del self._processed_requests[req_id]
-            logger.debug(f"Cleaned up expired request: {req_id}")
+    def _cache_request(self, request_id: str, result: Dict[str, Any]):
+        """Cache a processed request, evicting expired entries and any beyond the size cap"""
+        now = time.monotonic()
+        self._processed_requests[request_id] = (now, result)
+        self._processed_requests.move_to_end(request_id)
+        # Entries are kept oldest first, so expired ones are always at the head
+        cutoff = now - self._request_cache_ttl
+        while self._processed_requests:
+            timestamp, _ = next(iter(self._processed_requests.values()))
+            if timestamp >= cutoff and len(self._processed_requests) <= self._max_cached_requests:
+                break
+            self._processed_requests.popitem(last=False)
+    
+    def _log_player_states(self):
+        """Log a one-line summary of every player's betting state"""
+        log_info = logger.info
+        log_info("Player states:")
+        for p in self.state.players:
+            log_info("  %s: stack=$%d, current_bet=$%d, last_action=%s, folded=%s",
+                     p.name, p.stack, p.current_bet, p.last_action.value if p.last_action else 'None', p.has_folded)
     
     def _validate_chip_integrity(self, checkpoint: str):
         """Validate that total chips in play match expected amount"""
@@ -1695,9 +1855,7 @@ class PokerGame:
         for p in self.state.players:
             total_chips += p.total_bet_this_hand  # Use total bet for entire hand
             
-        expected_total = self.config['heroStack'] * self.config['bigBlind']
-        for stack in self.config['opponentStacks']:
-            expected_total += stack * self.config['bigBlind']
+        expected_total = self._expected_total_chips
             
         if total_chips != expected_total:
             logger.error(f"CHIP INTEGRITY ERROR at {checkpoint}!")
@@ -1709,26 +1867,25 @@ class PokerGame:
             # Log last few chip movements
             if self._chip_movements:
                 logger.error("Recent chip movements:")
-                for movement in self._chip_movements[-5:]:
+                recent = itertools.islice(self._chip_movements, max(0, len(self._chip_movements) - 5), None)
+                for movement in recent:
                     logger.error(f"  {movement}")
     
-    def _record_chip_movement(self, player_id: str, amount: int, reason: str, state_before: int):
+    def _record_chip_movement(self, player: Player, amount: int, reason: str, state_before: int):
         """Record chip movement for audit trail"""
-        player = self._get_player_by_id(player_id)
-        if player:
-            movement = {
-                "timestamp": time.time(),
-                "hand_number": self.state.hand_number,
-                "player_id": player_id,
-                "player_name": player.name,
-                "amount": amount,
-                "reason": reason,
-                "stack_before": state_before,
-                "stack_after": player.stack,
-                "state_version": self._state_version
-            }
-            self._chip_movements.append(movement)
-            logger.debug(f"Chip movement: {player.name} {amount:+d} ({reason}) [{state_before} -> {player.stack}]")
+        self._chip_movement_count += 1
+        self._chip_movements.append({
+            "timestamp": time.time(),
+            "hand_number": self.state.hand_number,
+            "player_id": player.id,
+            "player_name": player.name,
+            "amount": amount,
+            "reason": reason,
+            "stack_before": state_before,
+            "stack_after": player.stack,
+            "state_version": self._state_version
+        })
+        logger.debug("Chip movement: %s %+d (%s) [%s -> %s]", player.name, amount, reason, state_before, player.stack)
     
     def _validate_game_state(self) -> Dict[str, Any]:
         """Comprehensive state validation"""
@@ -1740,9 +1897,7 @@ class PokerGame:
         for p in self.state.players:
             total_chips += p.total_bet_this_hand  # Use total bet for entire hand
             
-        expected_total = self.config['heroStack'] * self.config['bigBlind']
-        for stack in self.config['opponentStacks']:
-            expected_total += stack * self.config['bigBlind']
+        expected_total = self._expected_total_chips
             
         if total_chips != expected_total:
             errors.append(f"Chip integrity error: expected ${expected_total}, found ${total_chips}")
@@ -1802,25 +1957,25 @@ class PokerGame:
         }
     
     def _create_state_snapshot(self) -> Dict[str, Any]:
-        """Create a deep copy snapshot of the current game state"""
-        import copy
-        
+        """Create a snapshot copy of the current game state"""
         snapshot = {
-            "state": copy.deepcopy(self.state),
+            "state": self.state.copy(),
             "state_version": self._state_version,
             "timestamp": time.time(),
-            "chip_movements_count": len(self._chip_movements)
+            "chip_movements_count": self._chip_movement_count
         }
         
         # Store snapshot
         self._state_snapshots[self._state_version] = snapshot
         
-        # Clean up old snapshots if we have too many
-        if len(self._state_snapshots) > self._max_snapshots:
-            oldest_versions = sorted(self._state_snapshots.keys())[:-self._max_snapshots]
-            for version in oldest_versions:
-                del self._state_snapshots[version]
-                logger.debug(f"Removed old snapshot version {version}")
+        # Clean up old snapshots if we have too many - rollback only ever needs the
+        # latest one, so the longer history is kept only while debugging
+        max_snapshots = self._max_snapshots if self._debug else 1
+        while len(self._state_snapshots) > max_snapshots:
+            # Versions only grow, so the first key is always the oldest
+            version = next(iter(self._state_snapshots))
+            del self._state_snapshots[version]
+            logger.debug(f"Removed old snapshot version {version}")
         
         logger.debug(f"Created state snapshot v{self._state_version}, total snapshots: {len(self._state_snapshots)}")
         return snapshot
@@ -1831,29 +1986,44 @@ class PokerGame:
             logger.error(f"Snapshot version {version} not found")
             return False
         
-        import copy
         snapshot = self._state_snapshots[version]
         
         # Restore state
-        self.state = copy.deepcopy(snapshot["state"])
+        self.state = snapshot["state"].copy()
+        self._serialized_state = None
         self._state_version = snapshot["state_version"]
         
         # Trim chip movements to match snapshot
         snapshot_movements_count = snapshot["chip_movements_count"]
-        self._chip_movements = self._chip_movements[:snapshot_movements_count]
+        for _ in range(min(self._chip_movement_count - snapshot_movements_count, len(self._chip_movements))):
+            self._chip_movements.pop()
+        self._chip_movement_count = snapshot_movements_count
         
         logger.info(f"Restored state to version {version} from {time.time() - snapshot['timestamp']:.2f}s ago")
         return True
     
     def _serialize_state(self) -> Dict[str, Any]:
-        """Serialize game state for client"""
+        """Serialize game state for client
+        
+        The result is reused until the next call into a method that changes the
+        state, so repeated polls between actions skip the rebuild. It is shared by
+        every response and by cached duplicate-request results, so it is read-only:
+        its sequences are tuples, copied from the engine's lists, and callers must
+        not mutate its dicts.
+        """
+        if self._serialized_state is not None:
+            return self._serialized_state
+        
         # Calculate current pot total (all money bet in this hand)
         current_pot_total = 0
         
+        state = self.state
+        
         # Debug logging for hole cards
-        for p in self.state.players:
-            if p.id == "hero":
-                logger.info(f"Serializing hero: is_ai={p.is_ai}, hole_cards={p.hole_cards}, phase={self.state.phase.name}")
+        if logger.isEnabledFor(logging.INFO):
+            for p in state.players:
+                if p.id == "hero":
+                    logger.info("Serializing hero: is_ai=%s, hole_cards=%s, phase=%s", p.is_ai, p.hole_cards, state.phase.name)
         
         # Since we only calculate pots at showdown, during betting we need to
         # show the total of all bets made this hand
@@ -1862,43 +2032,54 @@ class PokerGame:
             for pot in self.state.pots:
                 current_pot_total += pot.amount
         else:
-            # During betting, sum all player contributions
-            for player in self.state.players:
-                current_pot_total += player.total_bet_this_hand
+            # During betting, use the running total of all player contributions
+            current_pot_total = self.state.total_wagered
+        
+        # AI hole cards are only revealed at showdown
+        reveal_ai_cards = state.phase == GamePhase.SHOWDOWN
+        dealer_position = state.dealer_position
+        sb_position = state.sb_position
+        bb_position = state.bb_position
+        players = []
+        for p in state.players:
+            last_action = p.last_action.value if p.last_action else None
+            players.append({
+                "id": p.id,
+                "name": p.name,
+                "stack": p.stack,
+                "position": p.position,
+                "is_ai": p.is_ai,
+                "is_active": p.is_active,
+                "has_folded": p.has_folded,
+                "hole_cards": tuple(p.hole_cards) if not p.is_ai or reveal_ai_cards else _HIDDEN_CARDS,
+                "current_bet": p.current_bet,
+                "last_action": last_action,
+                "is_dealer": p.position == dealer_position,
+                "is_small_blind": p.position == sb_position,
+                "is_big_blind": p.position == bb_position
+            })
         
-        return {
+        self._serialized_state = {
             "game_id": self.state.game_id,
             "phase": self.state.phase.name,
             "hand_number": self.state.hand_number,
             "awaiting_card_deal": self.state.awaiting_card_deal,
             "all_players_all_in": self.state.all_players_all_in,
-            "players": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "stack": p.stack,
-                    "position": p.position,
-                    "is_ai": p.is_ai,
-                    "is_active": p.is_active,
-                    "has_folded": p.has_folded,
-                    "hole_cards": p.hole_cards if not p.is_ai or self.state.phase == GamePhase.SHOWDOWN else ["?", "?"],
-                    "current_bet": p.current_bet,
-                    "last_action": p.last_action.value if p.last_action else None,
-                    "is_dealer": p.position == self.state.dealer_position,
-                    "is_small_blind": p.position == self._get_small_blind_position(),
-                    "is_big_blind": p.position == self._get_big_blind_position()
-                }
-                for p in self.state.players
-            ],
-            "board_cards": self.state.board_cards,
-            "pots": [
-                {"amount": pot.amount, "eligible_players": pot.eligible_players}
+            "players": tuple(players),
+            "board_cards": tuple(self.state.board_cards),
+            "pots": tuple(
+                {"amount": pot.amount, "eligible_players": tuple(pot.eligible_players)}
                 for pot in self.state.pots
-            ],
+            ),
             "current_bet": self.state.current_bet,
             "min_raise": self.state.min_raise,
             "action_on": self.state.action_on,
             "big_blind": self.state.big_blind,
             "small_blind": self.state.small_blind,
             "current_pot_total": current_pot_total  # Add total pot for display
-        }
\ No newline at end of file
+        }
+        return self._serialized_state
+
+
+# Unshuffled 52-card deck, built once - each hand samples the cards it needs from it
+_FULL_DECK: Tuple[str, ...] = tuple(f"{rank}{suit}" for rank in PokerGame.RANKS for suit in PokerGame.SUITS)
@@ -0,0 +1,27 @@
+"""Shared pytest fixtures for the game tests."""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+
+from camelot.game.poker_game import PokerGame
+
+
+# Hero plus two AI opponents, 100 BB each
+DEFAULT_CONFIG = {
+    'players': 3,
+    'heroStack': 100,
+    'opponentStacks': [100, 100],
+    'difficulty': 'normal',
+    'bigBlind': 10
+}
+
+
+@pytest.fixture(scope="session")
+def poker_game_factory():
+    """Build a PokerGame from DEFAULT_CONFIG with keyword overrides."""
+    def make(**overrides):
+        return PokerGame({**DEFAULT_CONFIG, **overrides})
+    return make
@@ -4,8 +4,17 @@ import asyncio
 import aiohttp
 import json
 import sys
-from typing import Dict, Any, Optional
+from hashlib import blake2b
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from operator import itemgetter
+
+
+# Shared by every session so a hung server can't stall a poll indefinitely
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=1, sock_read=4)
+
+_STATE_GETTER = itemgetter('phase', 'action_on')
+_PLAYER_GETTER = itemgetter('stack', 'current_bet', 'last_action', 'has_folded', 'name')
 
 
 class GameStateInspector:
@@ -13,206 +22,324 @@ class GameStateInspector:
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
+        # Comparable player tuples by player id from the last _detect_changes call
+        self._player_tuples_source = None
+        self._player_tuples = {}
         
-    async def inspect_game(self, game_id: str):
+    async def inspect_game(self, game_id: str, session: Optional[aiohttp.ClientSession] = None):
         """Comprehensive game state inspection"""
-        async with aiohttp.ClientSession() as session:
-            print(f"\n{'='*80}")
-            print(f"GAME STATE INSPECTION - {game_id}")
-            print(f"Time: {datetime.now().isoformat()}")
-            print(f"{'='*80}\n")
-            
-            # Get game state
-            state = await self._get_game_state(session, game_id)
-            if not state:
-                print("ERROR: Could not retrieve game state")
-                return
-            
-            # Basic info
-            print("=== GAME INFO ===")
-            print(f"Game ID: {state['game_id']}")
-            print(f"Phase: {state['phase']}")
-            print(f"Hand Number: {state['hand_number']}")
-            print(f"Board Cards: {state.get('board_cards', [])}")
-            print(f"Current Bet: ${state['current_bet']}")
-            print(f"Min Raise: ${state['min_raise']}")
-            print(f"Action On: Position {state['action_on']}")
-            
-            # Pot info
-            print("\n=== POTS ===")
-            pots = state.get('pots', [])
-            total_pot = sum(pot['amount'] for pot in pots)
-            print(f"Total Pot: ${total_pot}")
-            for i, pot in enumerate(pots):
-                print(f"  Pot {i+1}: ${pot['amount']} - Eligible: {pot['eligible_players']}")
-            
-            # Player states
-            print("\n=== PLAYERS ===")
-            total_chips_in_play = 0
-            for p in state['players']:
-                status = []
-                if p['has_folded']:
-                    status.append("FOLDED")
-                if p['stack'] == 0:
-                    status.append("ALL-IN")
-                if state['action_on'] == p['position']:
-                    status.append("TO ACT")
-                
-                status_str = f" [{', '.join(status)}]" if status else ""
-                print(f"Position {p['position']} - {p['name']}{status_str}")
-                print(f"  Stack: ${p['stack']}")
-                print(f"  Current Bet: ${p['current_bet']}")
-                print(f"  Hole Cards: {p['hole_cards']}")
-                print(f"  Last Action: {p['last_action'] or 'None'}")
-                
-                total_chips_in_play += p['stack'] + p['current_bet']
-            
-            print(f"\nTotal Chips in Play: ${total_chips_in_play}")
+        if session is None:
+            async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+                return await self.inspect_game(game_id, session)
+        
+        # Output is collected and written in one go rather than line by line
+        sys.stdout.write(
+            f"\n{'='*80}\n"
+            f"GAME STATE INSPECTION - {game_id}\n"
+            f"Time: {datetime.now().isoformat()}\n"
+            f"{'='*80}\n\n"
+        )
+        
+        # Get game state
+        state = await self._get_game_state(session, game_id)
+        if not state:
+            print("ERROR: Could not retrieve game state")
+            return
+        
+        lines = []
+        append = lines.append
+        
+        # Basic info
+        append("=== GAME INFO ===")
+        append(f"Game ID: {state['game_id']}")
+        append(f"Phase: {state['phase']}")
+        append(f"Hand Number: {state['hand_number']}")
+        append(f"Board Cards: {state.get('board_cards', [])}")
+        append(f"Current Bet: ${state['current_bet']}")
+        append(f"Min Raise: ${state['min_raise']}")
+        append(f"Action On: Position {state['action_on']}")
+        
+        # Pot info
+        append("\n=== POTS ===")
+        pots = state.get('pots', [])
+        total_pot = sum(pot['amount'] for pot in pots)
+        append(f"Total Pot: ${total_pot}")
+        for i, pot in enumerate(pots):
+            append(f"  Pot {i+1}: ${pot['amount']} - Eligible: {pot['eligible_players']}")
+        
+        # Player states
+        append("\n=== PLAYERS ===")
+        total_chips_in_play = 0
+        action_on = state['action_on']
+        for p in state['players']:
+            stack, bet, position = p['stack'], p['current_bet'], p['position']
+            status = []
+            if p['has_folded']:
+                status.append("FOLDED")
+            if stack == 0:
+                status.append("ALL-IN")
+            if action_on == position:
+                status.append("TO ACT")
             
-            # Get monitoring metrics
-            await self._check_game_health(session, game_id)
+            status_str = f" [{', '.join(status)}]" if status else ""
+            append(f"Position {position} - {p['name']}{status_str}")
+            append(f"  Stack: ${stack}")
+            append(f"  Current Bet: ${bet}")
+            append(f"  Hole Cards: {p['hole_cards']}")
+            append(f"  Last Action: {p['last_action'] or 'None'}")
             
-            # Get hand history
-            await self._show_recent_hands(session, game_id)
+            total_chips_in_play += stack + bet
+        
+        append(f"\nTotal Chips in Play: ${total_chips_in_play}")
+        
+        # Get monitoring metrics
+        lines.extend(await self._check_game_health(session, game_id))
+        
+        # Get hand history
+        lines.extend(await self._show_recent_hands(session, game_id))
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    async def monitor_game(self, game_id: str, interval: int = 2):
-        """Live monitoring of game state changes"""
+    async def monitor_game(self, game_id: str, interval: float = 2,
+                           session: Optional[aiohttp.ClientSession] = None,
+                           min_interval: Optional[float] = None,
+                           max_interval: Optional[float] = None,
+                           backoff_factor: float = 1.5):
+        """Live monitoring of game state changes
+        
+        Polls at ``min_interval`` (defaults to ``interval``) right after a change
+        or while the game is between streets, and backs off by ``backoff_factor``
+        up to ``max_interval`` (defaults to ``interval * 8``) while it is idle.
+        """
+        if session is None:
+            # One session for the whole run so polls reuse its pooled connections
+            async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+                return await self.monitor_game(game_id, interval, session,
+                                               min_interval, max_interval, backoff_factor)
+        
+        if min_interval is None:
+            min_interval = interval
+        if max_interval is None:
+            max_interval = interval * 8
+        
         print(f"Starting live monitoring of game {game_id}")
         print("Press Ctrl+C to stop\n")
         
         last_state = None
+        last_body_hash = None
+        current_interval = min_interval
         
         try:
             while True:
-                async with aiohttp.ClientSession() as session:
-                    state = await self._get_game_state(session, game_id)
-                    
-                    if not state:
-                        print("ERROR: Could not retrieve game state")
-                        await asyncio.sleep(interval)
-                        continue
-                    
-                    # Check for changes
-                    if last_state:
-                        changes = self._detect_changes(last_state, state)
-                        if changes:
-                            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] State Changes Detected:")
-                            for change in changes:
-                                print(f"  - {change}")
-                    
-                    last_state = state
-                    await asyncio.sleep(interval)
-                    
+                body = await self._fetch_game_state_body(session, game_id)
+                
+                # Byte-identical response: nothing changed, skip parsing and diffing
+                body_hash = blake2b(body, digest_size=8).digest() if body else None
+                if body_hash is not None and body_hash == last_body_hash:
+                    current_interval = min(current_interval * backoff_factor, max_interval)
+                    await asyncio.sleep(current_interval)
+                    continue
+                
+                state = self._parse_game_state(body)
+                
+                if not state:
+                    print("ERROR: Could not retrieve game state")
+                    current_interval = min(current_interval * backoff_factor, max_interval)
+                    await asyncio.sleep(current_interval)
+                    continue
+                
+                # Check for changes
+                changes = None
+                if last_state:
+                    changes = self._detect_changes(last_state, state)
+                    if changes:
+                        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] State Changes Detected:")
+                        for change in changes:
+                            print(f"  - {change}")
+                
+                # Poll fast right after a change or while cards/showdown are pending,
+                # back off while players are thinking
+                if changes or self._is_transitional(state):
+                    current_interval = min_interval
+                else:
+                    current_interval = min(current_interval * backoff_factor, max_interval)
+                
+                last_state = state
+                last_body_hash = body_hash
+                await asyncio.sleep(current_interval)
+                
         except KeyboardInterrupt:
             print("\nMonitoring stopped")
     
-    async def check_chip_integrity(self, game_id: str):
+    async def check_chip_integrity(self, game_id: str, session: Optional[aiohttp.ClientSession] = None):
         """Detailed chip integrity check"""
-        async with aiohttp.ClientSession() as session:
-            print(f"\n{'='*60}")
-            print("CHIP INTEGRITY CHECK")
-            print(f"{'='*60}\n")
-            
-            state = await self._get_game_state(session, game_id)
-            if not state:
-                return
-            
-            # Calculate expected chips (this should match game config)
-            # For now, just check that chips are consistent
-            player_chips = sum(p['stack'] + p['current_bet'] for p in state['players'])
-            pot_chips = sum(pot['amount'] for pot in state.get('pots', []))
-            
-            print(f"Player Chips (stacks + bets): ${player_chips}")
-            print(f"Pot Chips: ${pot_chips}")
-            print(f"Total Accounted: ${player_chips + pot_chips}")
-            
-            # Check each player
-            print("\nPer-Player Breakdown:")
-            for p in state['players']:
-                total = p['stack'] + p['current_bet']
-                print(f"  {p['name']}: ${p['stack']} stack + ${p['current_bet']} bet = ${total}")
+        if session is None:
+            async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+                return await self.check_chip_integrity(game_id, session)
+        
+        sys.stdout.write(f"\n{'='*60}\nCHIP INTEGRITY CHECK\n{'='*60}\n\n")
+        
+        state = await self._get_game_state(session, game_id)
+        if not state:
+            return
+        
+        # Calculate expected chips (this should match game config)
+        # For now, just check that chips are consistent
+        # Per-player breakdown and total are built in the same pass
+        player_chips = 0
+        breakdown = []
+        for p in state['players']:
+            stack, bet = p['stack'], p['current_bet']
+            player_chips += stack + bet
+            breakdown.append(f"  {p['name']}: ${stack} stack + ${bet} bet = ${stack + bet}")
+        pot_chips = sum(pot['amount'] for pot in state.get('pots', []))
+        
+        lines = [
+            f"Player Chips (stacks + bets): ${player_chips}",
+            f"Pot Chips: ${pot_chips}",
+            f"Total Accounted: ${player_chips + pot_chips}",
+            "\nPer-Player Breakdown:",
+        ]
+        lines.extend(breakdown)
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     async def _get_game_state(self, session: aiohttp.ClientSession, game_id: str) -> Optional[Dict[str, Any]]:
         """Get current game state"""
+        return self._parse_game_state(await self._fetch_game_state_body(session, game_id))
+    
+    async def _fetch_game_state_body(self, session: aiohttp.ClientSession, game_id: str) -> Optional[bytes]:
+        """Get the raw game state response body"""
         try:
             async with session.get(f"{self.base_url}/api/game/{game_id}/state") as response:
                 if response.status == 200:
-                    data = await response.json()
-                    return data.get("state")
+                    return await response.read()
         except Exception as e:
             print(f"Error getting game state: {e}")
         return None
     
-    async def _check_game_health(self, session: aiohttp.ClientSession, game_id: str):
-        """Check game health from monitoring"""
+    @staticmethod
+    def _parse_game_state(body: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """Decode a game state response body"""
+        if not body:
+            return None
+        try:
+            return json.loads(body).get("state")
+        except ValueError as e:
+            print(f"Error getting game state: {e}")
+        return None
+    
+    async def _check_game_health(self, session: aiohttp.ClientSession, game_id: str) -> List[str]:
+        """Check game health from monitoring, returning the report lines"""
+        lines = ["\n=== GAME HEALTH ==="]
+        append = lines.append
         try:
-            print("\n=== GAME HEALTH ===")
             async with session.get(f"{self.base_url}/api/game/monitor/game/{game_id}") as response:
                 if response.status == 200:
                     health = await response.json()
-                    print(f"Status: {health['status'].upper()}")
-                    print(f"Message: {health['message']}")
+                    append(f"Status: {health['status'].upper()}")
+                    append(f"Message: {health['message']}")
                     
                     metrics = health.get('metrics', {})
                     if metrics:
-                        print(f"Total Actions: {metrics.get('total_actions', 0)}")
-                        print(f"Duplicate Rate: {metrics.get('duplicate_rate', 0):.2%}")
-                        print(f"Error Rate: {metrics.get('error_rate', 0):.2%}")
+                        append(f"Total Actions: {metrics.get('total_actions', 0)}")
+                        append(f"Duplicate Rate: {metrics.get('duplicate_rate', 0):.2%}")
+                        append(f"Error Rate: {metrics.get('error_rate', 0):.2%}")
                         
                         breakdown = metrics.get('action_breakdown', {})
                         if breakdown:
-                            print("Action Breakdown:")
+                            append("Action Breakdown:")
                             for action, count in breakdown.items():
-                                print(f"  {action}: {count}")
+                                append(f"  {action}: {count}")
         except Exception as e:
-            print(f"Could not get health metrics: {e}")
+            append(f"Could not get health metrics: {e}")
+        return lines
     
-    async def _show_recent_hands(self, session: aiohttp.ClientSession, game_id: str):
-        """Show recent hand history"""
+    async def _show_recent_hands(self, session: aiohttp.ClientSession, game_id: str) -> List[str]:
+        """Show recent hand history, returning the report lines"""
+        lines = ["\n=== RECENT HANDS ==="]
+        append = lines.append
         try:
-            print("\n=== RECENT HANDS ===")
             async with session.get(f"{self.base_url}/api/game/{game_id}/hand-history") as response:
                 if response.status == 200:
                     data = await response.json()
                     hands = data.get("hands", [])[:3]  # Show last 3 hands
                     
                     if not hands:
-                        print("No completed hands yet")
-                        return
+                        append("No completed hands yet")
+                        return lines
                     
                     for hand in hands:
-                        print(f"\nHand #{hand['hand_number']}:")
-                        print(f"  Board: {' '.join(hand['board_cards'])}")
-                        print(f"  Winner: {hand['winner']} (${hand['pot_size']})")
+                        lines.extend((
+                            f"\nHand #{hand['hand_number']}:",
+                            f"  Board: {' '.join(hand['board_cards'])}",
+                            f"  Winner: {hand['winner']} (${hand['pot_size']})",
+                        ))
         except Exception as e:
-            print(f"Could not get hand history: {e}")
+            append(f"Could not get hand history: {e}")
+        return lines
+    
+    @staticmethod
+    def _is_transitional(state: Dict[str, Any]) -> bool:
+        """Whether the game is between streets and about to change on its own"""
+        return bool(state.get('awaiting_card_deal') or state.get('all_players_all_in')
+                    or state.get('phase') == 'SHOWDOWN')
     
     def _detect_changes(self, old_state: Dict[str, Any], new_state: Dict[str, Any]) -> list:
         """Detect what changed between states"""
+        if old_state is new_state:
+            return []
+        
         changes = []
         
+        old_phase, old_action_on = _STATE_GETTER(old_state)
+        new_phase, new_action_on = _STATE_GETTER(new_state)
+        
         # Check phase change
-        if old_state['phase'] != new_state['phase']:
-            changes.append(f"Phase: {old_state['phase']} -> {new_state['phase']}")
+        if old_phase != new_phase:
+            changes.append(f"Phase: {old_phase} -> {new_phase}")
         
         # Check action position
-        if old_state['action_on'] != new_state['action_on']:
-            changes.append(f"Action moved to position {new_state['action_on']}")
-        
-        # Check player changes
-        for i, (old_p, new_p) in enumerate(zip(old_state['players'], new_state['players'])):
-            if old_p['stack'] != new_p['stack']:
-                diff = new_p['stack'] - old_p['stack']
-                changes.append(f"{new_p['name']}: stack ${old_p['stack']} -> ${new_p['stack']} ({diff:+d})")
+        if old_action_on != new_action_on:
+            changes.append(f"Action moved to position {new_action_on}")
+        
+        # Check player changes, matched by id so seat order changes aren't reported;
+        # the previous poll's tuples are reused when diffing against it
+        old_players = old_state['players']
+        if self._player_tuples_source is old_players:
+            old_by_id = self._player_tuples
+        else:
+            old_by_id = {p['id']: _PLAYER_GETTER(p) for p in old_players}
+        new_players = new_state['players']
+        new_by_id = {p['id']: _PLAYER_GETTER(p) for p in new_players}
+        self._player_tuples_source = new_players
+        self._player_tuples = new_by_id
+        
+        for player_id, new_t in new_by_id.items():
+            old_t = old_by_id.get(player_id)
+            if old_t == new_t:
+                continue
+            if old_t is None:
+                changes.append(f"{new_t[-1]}: joined")
+                continue
+            old_stack, old_bet, old_action, old_folded, _ = old_t
+            stack, bet, action, folded, name = new_t
+            
+            if old_stack != stack:
+                changes.append(f"{name}: stack ${old_stack} -> ${stack} ({stack - old_stack:+d})")
             
-            if old_p['current_bet'] != new_p['current_bet']:
-                changes.append(f"{new_p['name']}: bet ${old_p['current_bet']} -> ${new_p['current_bet']}")
+            if old_bet != bet:
+                changes.append(f"{name}: bet ${old_bet} -> ${bet}")
             
-            if old_p['last_action'] != new_p['last_action'] and new_p['last_action']:
-                changes.append(f"{new_p['name']}: {new_p['last_action']}")
+            if old_action != action and action:
+                changes.append(f"{name}: {action}")
             
-            if not old_p['has_folded'] and new_p['has_folded']:
-                changes.append(f"{new_p['name']}: FOLDED")
+            if not old_folded and folded:
+                changes.append(f"{name}: FOLDED")
+        
+        for player_id, old_t in old_by_id.items():
+            if player_id not in new_by_id:
+                changes.append(f"{old_t[-1]}: left")
         
         # Check board cards
         if len(old_state.get('board_cards', [])) != len(new_state.get('board_cards', [])):
@@ -235,20 +362,20 @@ async def main():
     command = sys.argv[1]
     inspector = GameStateInspector()
     
-    if command == "inspect" and len(sys.argv) > 2:
-        await inspector.inspect_game(sys.argv[2])
-    elif command == "monitor" and len(sys.argv) > 2:
-        await inspector.monitor_game(sys.argv[2])
-    elif command == "chips" and len(sys.argv) > 2:
-        await inspector.check_chip_integrity(sys.argv[2])
-    elif command == "metrics":
-        async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+        if command == "inspect" and len(sys.argv) > 2:
+            await inspector.inspect_game(sys.argv[2], session)
+        elif command == "monitor" and len(sys.argv) > 2:
+            await inspector.monitor_game(sys.argv[2], session=session)
+        elif command == "chips" and len(sys.argv) > 2:
+            await inspector.check_chip_integrity(sys.argv[2], session)
+        elif command == "metrics":
             async with session.get("http://localhost:8000/api/game/monitor/metrics") as response:
                 if response.status == 200:
                     metrics = await response.json()
                     print(json.dumps(metrics, indent=2))
-    else:
-        print(f"Unknown command: {command}")
+        else:
+            print(f"Unknown command: {command}")
 
 
 if __name__ == "__main__":
@@ -3,173 +3,130 @@
 
 import sys
 import os
+
+import pytest
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from camelot.core.hand_evaluator import (
-    evaluate_hand, get_winning_players, HandRank, Card
+    evaluate_hand, get_winning_players, get_winning_players_preparsed, HandRank, Card, parse_card
 )
 
 
-def test_basic_hands():
+# (name, hole, board, expected rank)
+BASIC_HANDS = [
+    ("Royal Flush", ['A♠', 'K♠'], ['Q♠', 'J♠', 'T♠', '5♦', '2♣'], HandRank.ROYAL_FLUSH),
+    ("Straight Flush", ['9♥', '8♥'], ['7♥', '6♥', '5♥', 'K♦', '2♣'], HandRank.STRAIGHT_FLUSH),
+    ("Four of a Kind", ['A♠', 'A♥'], ['A♦', 'A♣', 'K♠', 'Q♦', '2♣'], HandRank.FOUR_OF_A_KIND),
+    ("Full House", ['K♠', 'K♥'], ['K♦', 'Q♣', 'Q♠', '7♦', '2♣'], HandRank.FULL_HOUSE),
+    ("Flush", ['A♣', '9♣'], ['K♣', '7♣', '3♣', 'J♦', '2♠'], HandRank.FLUSH),
+    ("Straight", ['9♠', '8♦'], ['7♣', '6♥', '5♠', 'K♦', '2♣'], HandRank.STRAIGHT),
+    ("Three of a Kind", ['J♠', 'J♥'], ['J♦', 'Q♣', '8♠', '7♦', '2♣'], HandRank.THREE_OF_A_KIND),
+    ("Two Pair", ['K♠', 'K♥'], ['Q♦', 'Q♣', '8♠', '7♦', '2♣'], HandRank.TWO_PAIR),
+    ("One Pair", ['A♠', 'K♥'], ['A♦', 'Q♣', '8♠', '7♦', '2♣'], HandRank.ONE_PAIR),
+    ("High Card", ['A♠', 'K♥'], ['Q♦', 'J♣', '9♠', '7♦', '2♣'], HandRank.HIGH_CARD),
+]
+
+# (name, board, players, expected winners)
+WINNER_SCENARIOS = [
+    (
+        "Clear winner",
+        ['K♠', 'Q♦', 'J♣', '5♥', '2♠'],
+        {
+            'p1': ['A♠', 'T♠'],  # Straight (ace high)
+            'p2': ['K♥', 'K♣'],  # Three of a kind
+            'p3': ['Q♥', 'Q♣']   # Three of a kind (lower)
+        },
+        ['p1'],
+    ),
+    (
+        # Board has an ace-high straight that every player plays
+        "Tie scenario",
+        ['A♠', 'K♦', 'Q♣', 'J♥', 'T♠'],
+        {
+            'p1': ['9♠', '8♠'],  # Straight (lower)
+            'p2': ['7♥', '6♣'],  # Straight (lower)
+            'p3': ['2♦', '3♦']   # Straight (board plays)
+        },
+        ['p1', 'p2', 'p3'],
+    ),
+    (
+        "Kicker test",
+        ['K♠', 'K♦', '7♣', '5♥', '2♠'],
+        {
+            'p1': ['A♠', 'Q♠'],  # Pair of kings, ace kicker
+            'p2': ['A♥', 'J♣'],  # Pair of kings, ace-jack kicker
+            'p3': ['Q♦', 'J♦']   # Pair of kings, queen kicker
+        },
+        ['p1'],
+    ),
+]
+
+# (name, hole, board, expected rank, expected value or None)
+SPECIAL_CASES = [
+    # A-2-3-4-5 is a 5-high straight
+    ("Wheel straight", ['A♠', '4♥'], ['5♦', '3♣', '2♠', 'K♦', 'J♣'], HandRank.STRAIGHT, (5,)),
+    # '10' is accepted as well as 'T'
+    ("Three tens", ['10♠', '10♥'], ['10♦', 'Q♣', '8♠', '7♦', '2♣'], HandRank.THREE_OF_A_KIND, None),
+]
+
+
+@pytest.mark.parametrize("name, hole, board, expected_rank", BASIC_HANDS, ids=[c[0] for c in BASIC_HANDS])
+def test_basic_hands(name, hole, board, expected_rank):
     """Test basic hand evaluations."""
-    print("Testing basic hand evaluations...")
-    
-    # Test Royal Flush
-    hole = ['A♠', 'K♠']
-    board = ['Q♠', 'J♠', 'T♠', '5♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Royal Flush: {result}")
-    assert result.rank == HandRank.ROYAL_FLUSH
-    
-    # Test Straight Flush
-    hole = ['9♥', '8♥']
-    board = ['7♥', '6♥', '5♥', 'K♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Straight Flush: {result}")
-    assert result.rank == HandRank.STRAIGHT_FLUSH
-    
-    # Test Four of a Kind
-    hole = ['A♠', 'A♥']
-    board = ['A♦', 'A♣', 'K♠', 'Q♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Four of a Kind: {result}")
-    assert result.rank == HandRank.FOUR_OF_A_KIND
-    
-    # Test Full House
-    hole = ['K♠', 'K♥']
-    board = ['K♦', 'Q♣', 'Q♠', '7♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Full House: {result}")
-    assert result.rank == HandRank.FULL_HOUSE
-    
-    # Test Flush
-    hole = ['A♣', '9♣']
-    board = ['K♣', '7♣', '3♣', 'J♦', '2♠']
-    result = evaluate_hand(hole, board)
-    print(f"Flush: {result}")
-    assert result.rank == HandRank.FLUSH
-    
-    # Test Straight
-    hole = ['9♠', '8♦']
-    board = ['7♣', '6♥', '5♠', 'K♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Straight: {result}")
-    assert result.rank == HandRank.STRAIGHT
-    
-    # Test Three of a Kind
-    hole = ['J♠', 'J♥']
-    board = ['J♦', 'Q♣', '8♠', '7♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Three of a Kind: {result}")
-    assert result.rank == HandRank.THREE_OF_A_KIND
-    
-    # Test Two Pair
-    hole = ['K♠', 'K♥']
-    board = ['Q♦', 'Q♣', '8♠', '7♦', '2♣']
     result = evaluate_hand(hole, board)
-    print(f"Two Pair: {result}")
-    assert result.rank == HandRank.TWO_PAIR
-    
-    # Test One Pair
-    hole = ['A♠', 'K♥']
-    board = ['A♦', 'Q♣', '8♠', '7♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"One Pair: {result}")
-    assert result.rank == HandRank.ONE_PAIR
-    
-    # Test High Card
-    hole = ['A♠', 'K♥']
-    board = ['Q♦', 'J♣', '9♠', '7♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"High Card: {result}")
-    assert result.rank == HandRank.HIGH_CARD
-    
-    print("✓ All basic hand tests passed!\n")
+    print(f"{name}: {result}")
+    assert result.rank == expected_rank
 
 
-def test_winner_determination():
+@pytest.mark.parametrize("name, board, players, expected", WINNER_SCENARIOS, ids=[c[0] for c in WINNER_SCENARIOS])
+def test_winner_determination(name, board, players, expected):
     """Test determining winners in various scenarios."""
-    print("Testing winner determination...")
-    
-    board = ['K♠', 'Q♦', 'J♣', '5♥', '2♠']
-    
-    # Test 1: Clear winner
-    players = {
-        'p1': ['A♠', 'T♠'],  # Straight (ace high)
-        'p2': ['K♥', 'K♣'],  # Three of a kind
-        'p3': ['Q♥', 'Q♣']   # Three of a kind (lower)
-    }
     winners, evals = get_winning_players(players, board)
-    print(f"Test 1 - Clear winner:")
+    print(f"{name}:")
     for pid, eval in evals.items():
         print(f"  {pid}: {eval}")
     print(f"  Winners: {winners}")
-    assert winners == ['p1']
-    
-    # Test 2: Tie (split pot)
-    board2 = ['A♠', 'K♦', 'Q♣', 'J♥', 'T♠']  # Board has straight
-    players2 = {
-        'p1': ['9♠', '8♠'],  # Straight (lower)
-        'p2': ['7♥', '6♣'],  # Straight (lower)
-        'p3': ['2♦', '3♦']   # Straight (board plays)
-    }
-    winners2, evals2 = get_winning_players(players2, board2)
-    print(f"\nTest 2 - Tie scenario:")
-    for pid, eval in evals2.items():
-        print(f"  {pid}: {eval}")
-    print(f"  Winners: {winners2}")
-    # All players have ace-high straight from board
-    assert len(winners2) == 3
-    
-    # Test 3: Kicker matters
-    board3 = ['K♠', 'K♦', '7♣', '5♥', '2♠']
-    players3 = {
-        'p1': ['A♠', 'Q♠'],  # Pair of kings, ace kicker
-        'p2': ['A♥', 'J♣'],  # Pair of kings, ace-jack kicker  
-        'p3': ['Q♦', 'J♦']   # Pair of kings, queen kicker
-    }
-    winners3, evals3 = get_winning_players(players3, board3)
-    print(f"\nTest 3 - Kicker test:")
-    for pid, eval in evals3.items():
-        print(f"  {pid}: {eval}")
-    print(f"  Winners: {winners3}")
-    assert winners3 == ['p1']
-    
-    print("✓ All winner determination tests passed!\n")
+    assert sorted(winners) == expected
+
+
+def test_winner_determination_preparsed():
+    """Test that pre-parsed cards give the same result as card strings."""
+    _, board, players, expected = WINNER_SCENARIOS[2]
+    parsed_players = {pid: tuple(parse_card(c) for c in cards) for pid, cards in players.items()}
+    parsed_board = tuple(parse_card(c) for c in board)
+    
+    winners, evals = get_winning_players_preparsed(parsed_players, parsed_board)
+    _, string_evals = get_winning_players(players, board)
+    assert winners == expected
+    assert evals == string_evals
 
 
-def test_special_cases():
+@pytest.mark.parametrize("name, hole, board, expected_rank, expected_value", SPECIAL_CASES, ids=[c[0] for c in SPECIAL_CASES])
+def test_special_cases(name, hole, board, expected_rank, expected_value):
     """Test special cases like wheel straight."""
-    print("Testing special cases...")
-    
-    # Test wheel (A-2-3-4-5 straight)
-    hole = ['A♠', '4♥']
-    board = ['5♦', '3♣', '2♠', 'K♦', 'J♣']
     result = evaluate_hand(hole, board)
-    print(f"Wheel straight: {result}")
-    assert result.rank == HandRank.STRAIGHT
-    assert result.value == (5,)  # 5-high straight
+    print(f"{name}: {result}")
+    assert result.rank == expected_rank
+    if expected_value is not None:
+        assert result.value == expected_value
+
+
+def test_card_parsing():
+    """Test that parsed cards are reused and invalid cards still raise."""
+    print("Testing card parsing...")
     
-    # Test that 10 is handled correctly
-    hole = ['10♠', '10♥']
-    board = ['10♦', 'Q♣', '8♠', '7♦', '2♣']
-    result = evaluate_hand(hole, board)
-    print(f"Three tens: {result}")
-    assert result.rank == HandRank.THREE_OF_A_KIND
+    # Same string returns the same cached Card
+    assert parse_card('10♠') is parse_card('10♠')
+    assert parse_card('10♠') == Card('T♠')
+    
+    # Invalid cards are rejected every time, never cached
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            parse_card('X♠')
     
-    print("✓ All special case tests passed!\n")
+    print("✓ All card parsing tests passed!\n")
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("Hand Evaluator Test Suite")
-    print("=" * 60)
-    print()
-    
-    test_basic_hands()
-    test_winner_determination()
-    test_special_cases()
-    
-    print("=" * 60)
-    print("✅ ALL TESTS PASSED!")
-    print("=" * 60)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
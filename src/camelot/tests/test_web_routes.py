@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Test the web UI route table."""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from camelot.web.routes import router, _accepts_gzip
+
+
+def test_route_table():
+    """Each page is served by exactly one handler."""
+    paths = [route.path for route in router.routes]
+    assert sorted(paths) == ["/", "/game", "/logs", "/poker", "/system"]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", True),
+    ("deflate;q=1.0, gzip;q=0.5", True),
+    ("GZIP", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, deflate", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("deflate, br", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    """gzip is only served when the client accepts it with a non-zero q-value."""
+    assert _accepts_gzip(header) is expected
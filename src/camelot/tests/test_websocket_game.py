@@ -4,10 +4,15 @@ import asyncio
 import json
 import websockets
 import aiohttp
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uuid
 
 
+# Loopback test clients: no per-message deflate or keepalive pings to spend CPU and
+# background tasks on, and no cap on queued incoming frames
+WS_CONNECT_OPTIONS = {"compression": None, "ping_interval": None, "max_queue": None}
+
+
 class WebSocketGameTester:
     """Test WebSocket functionality for poker game"""
     
@@ -15,19 +20,41 @@ class WebSocketGameTester:
         self.base_url = base_url
         self.http_url = f"http://{base_url}"
         self.ws_url = f"ws://{base_url}"
+        # HTTP session shared by the API helpers so their requests reuse connections
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _http(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, opening it on first use"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
         
-    async def test_basic_connection(self):
+    async def test_basic_connection(self, game_id: Optional[str] = None):
         """Test basic WebSocket connection and disconnection"""
         print("\n=== Testing Basic WebSocket Connection ===")
         
-        # Start a game first
-        game_id = await self.start_game()
-        print(f"Started game: {game_id}")
+        # Start a game first unless one was shared with us
+        if game_id is None:
+            game_id = await self.start_game()
+            print(f"Started game: {game_id}")
         
         # Connect via WebSocket
         uri = f"{self.ws_url}/api/game/ws/{game_id}/hero"
         try:
-            async with websockets.connect(uri) as websocket:
+            async with websockets.connect(uri, **WS_CONNECT_OPTIONS) as websocket:
                 print("WebSocket connected successfully")
                 
                 # Wait for connection established message
@@ -67,20 +94,20 @@ class WebSocketGameTester:
         try:
             # Hero connection
             hero_uri = f"{self.ws_url}/api/game/ws/{game_id}/hero"
-            hero_ws = await websockets.connect(hero_uri)
+            hero_ws = await websockets.connect(hero_uri, **WS_CONNECT_OPTIONS)
             connections.append(('hero', hero_ws))
             print("Hero connected")
             
             # Spectator connections
             for i in range(3):
                 spec_uri = f"{self.ws_url}/api/game/ws/{game_id}/spectator_{i}"
-                spec_ws = await websockets.connect(spec_uri)
+                spec_ws = await websockets.connect(spec_uri, **WS_CONNECT_OPTIONS)
                 connections.append((f'spectator_{i}', spec_ws))
                 print(f"Spectator {i} connected")
             
-            # Wait for all connection messages
-            for name, ws in connections:
-                msg = await ws.recv()
+            # Wait for all connection messages at once
+            raw = await asyncio.gather(*(ws.recv() for _, ws in connections))
+            for (name, _), msg in zip(connections, raw):
                 data = json.loads(msg)
                 assert data['type'] == 'connection_established'
                 print(f"✅ {name} received connection confirmation")
@@ -95,17 +122,22 @@ class WebSocketGameTester:
                 }
             }))
             
-            # All connections should receive the update
+            # All connections should receive the update; the 2s timeout applies to all of them together
+            raw = await asyncio.gather(
+                *(asyncio.wait_for(ws.recv(), timeout=2.0) for _, ws in connections),
+                return_exceptions=True
+            )
             received_updates = []
-            for name, ws in connections:
-                try:
-                    msg = await asyncio.wait_for(ws.recv(), timeout=2.0)
-                    data = json.loads(msg)
-                    if data['type'] == 'game_update':
-                        received_updates.append(name)
-                        print(f"✅ {name} received game update")
-                except asyncio.TimeoutError:
+            for (name, _), msg in zip(connections, raw):
+                if isinstance(msg, asyncio.TimeoutError):
                     print(f"❌ {name} did not receive update")
+                    continue
+                if isinstance(msg, Exception):
+                    raise msg
+                data = json.loads(msg)
+                if data['type'] == 'game_update':
+                    received_updates.append(name)
+                    print(f"✅ {name} received game update")
             
             assert len(received_updates) >= 1  # At least hero should get update
             
@@ -123,7 +155,7 @@ class WebSocketGameTester:
         await self.start_hand(game_id)
         
         uri = f"{self.ws_url}/api/game/ws/{game_id}/hero"
-        async with websockets.connect(uri) as websocket:
+        async with websockets.connect(uri, **WS_CONNECT_OPTIONS) as websocket:
             # Wait for connection
             msg = await websocket.recv()
             data = json.loads(msg)
@@ -161,15 +193,16 @@ class WebSocketGameTester:
                 else:
                     print(f"Unexpected message type: {data['type']}")
     
-    async def test_reconnection(self):
+    async def test_reconnection(self, game_id: Optional[str] = None):
         """Test reconnection after disconnect"""
         print("\n=== Testing Reconnection ===")
         
-        game_id = await self.start_game()
+        if game_id is None:
+            game_id = await self.start_game()
         uri = f"{self.ws_url}/api/game/ws/{game_id}/hero"
         
         # First connection
-        ws1 = await websockets.connect(uri)
+        ws1 = await websockets.connect(uri, **WS_CONNECT_OPTIONS)
         msg = await ws1.recv()
         data = json.loads(msg)
         assert data['type'] == 'connection_established'
@@ -180,7 +213,7 @@ class WebSocketGameTester:
         print("Disconnected")
         
         # Reconnect
-        ws2 = await websockets.connect(uri)
+        ws2 = await websockets.connect(uri, **WS_CONNECT_OPTIONS)
         msg = await ws2.recv()
         data = json.loads(msg)
         assert data['type'] == 'connection_established'
@@ -194,42 +227,58 @@ class WebSocketGameTester:
     
     async def start_game(self) -> str:
         """Start a new game via HTTP API"""
-        async with aiohttp.ClientSession() as session:
-            config = {
-                "players": 3,
-                "heroStack": 100,
-                "opponentStacks": [100, 100],
-                "difficulty": "medium",
-                "bigBlind": 2
-            }
-            
-            async with session.post(f"{self.http_url}/api/game/start", json=config) as resp:
-                data = await resp.json()
-                return data['state']['game_id']
+        config = {
+            "players": 3,
+            "heroStack": 100,
+            "opponentStacks": [100, 100],
+            "difficulty": "medium",
+            "bigBlind": 2
+        }
+        
+        async with self._http().post(f"{self.http_url}/api/game/start", json=config) as resp:
+            data = await resp.json()
+            return data['state']['game_id']
     
     async def start_hand(self, game_id: str):
         """Start a new hand via HTTP API"""
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{self.http_url}/api/game/{game_id}/new-hand") as resp:
-                data = await resp.json()
-                return data
+        async with self._http().post(f"{self.http_url}/api/game/{game_id}/new-hand") as resp:
+            data = await resp.json()
+            return data
 
 
 async def main():
     """Run all WebSocket tests"""
-    tester = WebSocketGameTester()
+    import traceback
     
     try:
-        await tester.test_basic_connection()
-        await tester.test_action_via_websocket()
-        await tester.test_concurrent_connections()
-        await tester.test_reconnection()
+        async with WebSocketGameTester() as tester:
+            # The connection and reconnection tests don't change the game, so they share one
+            # and run one after the other (both connect as hero). The tests that act on a game
+            # get their own and run alongside them.
+            shared_game_id = await tester.start_game()
+            print(f"Started shared game: {shared_game_id}")
+            
+            async def read_only_tests():
+                await tester.test_basic_connection(shared_game_id)
+                await tester.test_reconnection(shared_game_id)
+            
+            tests = [
+                read_only_tests,
+                tester.test_action_via_websocket,
+                tester.test_concurrent_connections,
+            ]
+            results = await asyncio.gather(*(test() for test in tests), return_exceptions=True)
+        
+        failures = [(test.__name__, r) for test, r in zip(tests, results) if isinstance(r, Exception)]
+        for name, e in failures:
+            print(f"\n❌ {name} failed: {e}")
+            traceback.print_exception(e)
         
-        print("\n✅ All WebSocket tests passed!")
+        if not failures:
+            print("\n✅ All WebSocket tests passed!")
         
     except Exception as e:
         print(f"\n❌ Test failed: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -4,6 +4,9 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+from typing import Any, Dict, Tuple
+import gzip
+import hashlib
 import uuid
 
 # Set up templates directory
@@ -12,6 +15,75 @@ templates = Jinja2Templates(directory=str(templates_dir))
 
 router = APIRouter(tags=["web"])
 
+# Rendered page bodies (plain and gzip) and their md5 digest keyed by (template, context). The
+# pages only depend on a fixed title/flag, so each one is rendered and compressed once per process.
+_PAGE_CACHE: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[bytes, bytes, str]] = {}
+
+
+def _render_page(name: str, **context: Any) -> Tuple[bytes, bytes, str]:
+    """Return the rendered body, its gzip encoding and digest for a static-context template."""
+    key = (name, tuple(sorted(context.items())))
+    page = _PAGE_CACHE.get(key)
+    if page is None:
+        body = templates.get_template(name).render(**context).encode("utf-8")
+        page = (body, gzip.compress(body, compresslevel=9), hashlib.md5(body).hexdigest())
+        _PAGE_CACHE[key] = page
+    return page
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (q=0 means refused)."""
+    wildcard = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            # An explicit entry takes precedence over the wildcard
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return bool(wildcard)
+
+
+def _page_response(request: Request, name: str, **context: Any) -> Response:
+    """Serve a cached page, gzipped when accepted, answering 304 when the client already has it."""
+    body, gzip_body, digest = _render_page(name, **context)
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    # Each encoding is a different representation, so it gets its own ETag. Vary is set on
+    # every response, 304s included, since the body depends on Accept-Encoding
+    headers = {"Vary": "Accept-Encoding", "ETag": f'"{digest}-gzip"' if use_gzip else f'"{digest}"'}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        # No body, so no Content-Encoding either
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        body = gzip_body
+        headers["Content-Encoding"] = "gzip"
+    return HTMLResponse(content=body, headers=headers)
+
+
+# Every (template, context) pair the routes below serve
+_PAGES = (
+    ("index.html", {"title": "Camelot Poker Calculator"}),
+    ("index.html", {"title": "Camelot Poker Calculator", "show_poker": True}),
+    ("poker_game.html", {"title": "Camelot Poker Game"}),
+    ("system_testing.html", {"title": "System & Testing - Camelot"}),
+    ("log_viewer.html", {"title": "Log Viewer - Camelot"}),
+)
+
+
+def warm_page_cache() -> None:
+    """Render every page up front so the first visitor doesn't pay for template compilation."""
+    for name, context in _PAGES:
+        _render_page(name, **context)
+
 
 @router.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -19,10 +91,9 @@ async def home(request: Request):
     # Check if session exists, create if not
     session_id = request.cookies.get("session_id")
     
-    response = templates.TemplateResponse(
-        "index.html",
-        {"request": request, "title": "Camelot Poker Calculator"}
-    )
+    response = _page_response(request, "index.html", title="Camelot Poker Calculator")
+    # Returning visitors reuse their copy briefly, then revalidate against the ETag (304)
+    response.headers["Cache-Control"] = "private, max-age=60"
     
     # Set session cookie if not present
     if not session_id:
@@ -41,35 +112,22 @@ async def home(request: Request):
 @router.get("/game", response_class=HTMLResponse)
 async def poker_game(request: Request):
     """Render the poker game page."""
-    return templates.TemplateResponse(
-        "poker_game.html",
-        {"request": request, "title": "Camelot Poker Game"}
-    )
+    return _page_response(request, "poker_game.html", title="Camelot Poker Game")
 
 
 @router.get("/poker", response_class=HTMLResponse)
 async def poker_lobby(request: Request):
     """Redirect to home page with poker lobby section active."""
-    response = templates.TemplateResponse(
-        "index.html",
-        {"request": request, "title": "Camelot Poker Calculator", "show_poker": True}
-    )
-    return response
+    return _page_response(request, "index.html", title="Camelot Poker Calculator", show_poker=True)
 
 
 @router.get("/system", response_class=HTMLResponse)
 async def system_testing(request: Request):
     """Render the system and testing utilities page."""
-    return templates.TemplateResponse(
-        "system_testing.html",
-        {"request": request, "title": "System & Testing - Camelot"}
-    )
+    return _page_response(request, "system_testing.html", title="System & Testing - Camelot")
 
 
 @router.get("/logs", response_class=HTMLResponse)
 async def log_viewer(request: Request):
     """Render the log viewer page."""
-    return templates.TemplateResponse(
-        "log_viewer.html",
-        {"request": request, "title": "Log Viewer - Camelot"}
-    )
\ No newline at end of file
+    return _page_response(request, "log_viewer.html", title="Log Viewer - Camelot")
\ No newline at end of file